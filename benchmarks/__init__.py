@@ -0,0 +1 @@
+# Benchmarks of the render and update paths of My First Piano
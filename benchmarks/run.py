@@ -0,0 +1,270 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# Benchmarks of the hot paths of engine.py, run without a window or sound
+# card on SDL's dummy drivers so every machine measures the same code.
+#
+#   python -m benchmarks.run                 compare against the baseline
+#   python -m benchmarks.run --save          record a new baseline
+#   python -m benchmarks.run -k tiles        only benchmarks matching "tiles"
+#   python -m benchmarks.run --variant elora another game variant
+#
+# Each benchmark is timed in repeats of enough calls to last at least
+# REPEAT_TIME, and the fastest repeat counts, which filters out most of
+# the noise from other processes. Anything slower than the baseline by
+# more than the threshold is reported and makes the run exit with 1.
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from piano import assets, background, engine, fonts
+from piano.levels import LevelPack
+from piano.tiles import TileField
+from piano.variants import DEFAULT_VARIANT, VARIANTS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+TITLE_IMAGE = os.path.join(ROOT, "tata.jpg")
+THRESHOLD = 0.25  # Fraction slower than the baseline that counts as a regression
+REPEATS = 5
+REPEAT_TIME = 0.05  # Seconds, minimum length of one repeat
+
+assets_dir = None  # Scratch image cache, set up by setup_game()
+scratch_dir = None  # Scratch directory for generated files, set up by setup_game()
+
+# (name, setup) pairs. setup() prepares the state and returns the function
+# whose calls are timed.
+BENCHMARKS = []
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+@benchmark("gradient background")
+def bench_gradient():
+    background.invalidate()
+    engine.draw_gradient_background()  # Built once, like the first frame
+    return engine.draw_gradient_background
+
+
+@benchmark("draw tile")
+def bench_tile():
+    return lambda: engine.draw_tile(engine.screen, 100, 200, engine.BLACK)
+
+
+@benchmark("draw tile with letter")
+def bench_tile_letter():
+    return lambda: engine.draw_tile(engine.screen, 100, 200, engine.BLACK, "A")
+
+
+# A screenful of tiles, half of them with a letter
+SCREEN_TILES = [(i, (i % 4) * engine.TILE_WIDTH, (i // 4) * 40 - 150, "AB"[i % 2] if i % 3 else "", i % 3)
+                for i in range(20)]
+
+
+@benchmark("draw 20 tiles")
+def bench_tiles():
+    def draw():
+        for tile, x, y, letter, color in SCREEN_TILES:
+            engine.draw_tile(engine.screen, x, y, engine.TILE_COLORS[color], letter)
+    return draw
+
+
+@benchmark("draw 20 tiles from atlas")
+def bench_tiles_atlas():
+    engine.tile_atlas.build()
+    return lambda: engine.tile_atlas.blits(engine.screen, SCREEN_TILES)
+
+
+@benchmark("draw text")
+def bench_text():
+    return lambda: engine.draw_text(engine.screen, "Form Word: TWINKLE", 24, engine.BLACK, 200, 300)
+
+
+# Decoding and scaling the full size image, what the asset cache saves
+@benchmark("title image decode")
+def bench_image_decode():
+    size = (engine.SCREEN_WIDTH, engine.SCREEN_HEIGHT)
+    return lambda: assets._cover(pygame.image.load(TITLE_IMAGE), size).convert()
+
+
+# Loading the same image from the disk cache on a later launch
+@benchmark("title image cached")
+def bench_image_cached():
+    size = (engine.SCREEN_WIDTH, engine.SCREEN_HEIGHT)
+    assets.load_image(TITLE_IMAGE, size, cache_dir=assets_dir)
+
+    def load():
+        assets.invalidate()
+        return assets.load_image(TITLE_IMAGE, size, cache_dir=assets_dir)
+    return load
+
+
+# One frame of the tile field with count tiles on screen: move, drop the
+# tiles that left the screen, replace them and walk what is left to draw
+def tile_frame(count):
+    tiles = TileField(engine.TILE_WIDTH, engine.TILE_HEIGHT, engine.SCREEN_HEIGHT)
+    distance = engine.variant["tile_speed"] * engine.SIMULATION_STEP
+    spacing = (engine.SCREEN_HEIGHT + engine.TILE_HEIGHT) / count
+    for i in range(count):
+        tiles.spawn(i % 4, "A" if i % 2 else "")
+        tiles.advance(spacing)
+
+    def frame():
+        tiles.advance(distance)
+        tiles.cull()
+        for i in range(count - len(tiles)):
+            tiles.spawn(i % 4)
+        for tile in tiles.tiles(0.5):
+            pass
+    return frame
+
+
+for count in (10, 100, 1000):
+    benchmark(f"tile update {count}")(lambda count=count: tile_frame(count))
+
+
+@benchmark("read game data")
+def bench_read():
+    engine.read_game_data()
+    return engine.read_game_data
+
+
+# Record a round, wait until it is on disk and read today's progress
+@benchmark("game data round trip")
+def bench_round_trip():
+    play = {"level": 0, "completed": True, "score": 4, "duration_ms": 30000, "mistakes": 1}
+
+    def round_trip():
+        engine.write_game_data(play)
+        engine.get_game_store().flush()
+        return engine.read_game_data()
+    return round_trip
+
+
+# One frame of the level selection screen scrolled halfway down a pack of
+# count levels. The pack is written to the scratch directory and handed to
+# the menu, the game's own pack stays in place.
+def level_menu_frame(count):
+    path = os.path.join(scratch_dir, f"pack{count}.json")
+    with open(path, 'w') as f:
+        json.dump({"levels": [{"title": f"Song {i + 1}", "file": "song.json"} for i in range(count)]}, f)
+    menu = engine.LevelSelectionMenu(LevelPack(path))
+    menu.levels.select(count // 2, smooth=False)
+    return lambda: menu.draw(engine.screen)
+
+
+for count in (3, 3000):
+    benchmark(f"level menu {count}")(lambda count=count: level_menu_frame(count))
+
+
+# Seconds per call of function, the fastest of repeats
+def measure(function, repeats=REPEATS):
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= REPEAT_TIME:
+            break
+        number *= 2
+    best = elapsed
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def setup_game(data_dir):
+    global assets_dir, scratch_dir
+    pygame.display.init()
+    pygame.font.init()
+    engine.screen = pygame.display.set_mode((engine.SCREEN_WIDTH, engine.SCREEN_HEIGHT))
+    # Progress goes to a scratch database, never the player's
+    engine.DATA_FILE = os.path.join(data_dir, "game_data.sqlite3")
+    engine.LEGACY_DATA_FILE = None
+    assets_dir = os.path.join(data_dir, "assets")
+    scratch_dir = data_dir
+    fonts.text_cache.clear()
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the render and update paths")
+    parser.add_argument("-k", dest="match", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="fraction slower than the baseline reported as a regression")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default=DEFAULT_VARIANT,
+                        help="game variant whose settings the benchmarks use")
+    args = parser.parse_args(argv)
+    engine.variant = VARIANTS[args.variant]
+
+    baseline = load_baseline(args.baseline)
+    expected = baseline["results"] if baseline else {}
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        setup_game(data_dir)
+        for name, setup in BENCHMARKS:
+            if args.match not in name:
+                continue
+            seconds = measure(setup(), args.repeats)
+            results[name] = seconds
+            line = f"{name:<24} {seconds * 1e6:10.2f} us"
+            if name in expected:
+                change = seconds / expected[name] - 1
+                line += f"  {change:+7.1%} vs baseline"
+                if change > args.threshold:
+                    line += "  REGRESSION"
+                    regressions.append(name)
+            print(line)
+        if engine.game_store is not None:
+            engine.game_store.close()
+    pygame.quit()
+
+    if args.save:
+        data = {
+            "variant": args.variant,
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "results": dict(expected, **results),
+        }
+        with open(args.baseline, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) more than {args.threshold:.0%} slower than the baseline: "
+              + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# Shared engine pieces for My First Piano
@@ -0,0 +1,122 @@
+import argparse
+import hashlib
+import io
+import os
+import struct
+import threading
+
+import pygame
+
+# Images decoded and scaled once, then kept on disk at the size the game
+# draws them.
+#
+# The cache key is a hash of the source file's bytes with the target
+# size, so editing an image or changing the window size builds a new entry
+# and stale ones are never used. Entries hold raw pixels: loading one is a
+# read and a copy, with no JPEG decode and no smoothscale.
+#
+#   python -m piano.assets tata.jpg --size 400x600
+
+CACHE_DIR = os.environ.get("PIANO_ASSET_CACHE", ".asset_cache")
+MAGIC = b"PNOI"
+VERSION = 1
+HEADER = struct.Struct("<4sBxHHB")  # magic, version, width, height, alpha
+
+_images = {}
+_lock = threading.Lock()
+
+
+def _cache_path(data, size, alpha, cache_dir):
+    digest = hashlib.sha1(data).hexdigest()
+    return os.path.join(cache_dir, f"{digest}-{size[0]}x{size[1]}{'-alpha' if alpha else ''}.raw")
+
+
+# Scale image to cover size, cropping whatever sticks out evenly
+def _cover(image, size):
+    width, height = image.get_size()
+    scale = max(size[0] / width, size[1] / height)
+    scaled = pygame.transform.smoothscale(image, (max(size[0], round(width * scale)),
+                                                  max(size[1], round(height * scale))))
+    rect = pygame.Rect((0, 0), size)
+    rect.center = scaled.get_rect().center
+    return scaled.subsurface(rect).copy()
+
+
+def _read_cached(path, size, alpha):
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, width, height, cached_alpha = HEADER.unpack_from(data)
+    pixels = data[HEADER.size:]
+    mode = "RGBA" if alpha else "RGB"
+    if (magic, version, (width, height), bool(cached_alpha)) != (MAGIC, VERSION, tuple(size), alpha) \
+            or len(pixels) != width * height * len(mode):
+        return None
+    return pygame.image.frombytes(pixels, (width, height), mode)
+
+
+def _write_cached(path, image, alpha):
+    mode = "RGBA" if alpha else "RGB"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Written under a temporary name so a crash never leaves half an entry
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, image.get_width(), image.get_height(), alpha))
+        f.write(pygame.image.tobytes(image, mode))
+    os.replace(temp, path)
+
+
+# Surface of the image at path scaled to size, in display format once a
+# display exists. Decodes and scales the image only if the disk cache
+# has no entry for this file content and size yet.
+def load_image(path, size, alpha=False, cache_dir=CACHE_DIR):
+    size = tuple(size)
+    key = (path, size, alpha)
+    with _lock:
+        image = _images.get(key)
+    if image is not None:
+        return image
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    cache_path = _cache_path(data, size, alpha, cache_dir)
+    image = _read_cached(cache_path, size, alpha)
+    if image is None:
+        image = _cover(pygame.image.load(io.BytesIO(data), path), size)
+        try:
+            _write_cached(cache_path, image, alpha)
+        except OSError as e:
+            print(f"Can't cache image {path}: {e}")
+
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        image = image.convert_alpha() if alpha else image.convert()
+    with _lock:
+        _images[key] = image
+    return image
+
+
+# Forget the images kept in memory, e.g. after the display mode changed
+def invalidate():
+    with _lock:
+        _images.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the disk cache of scaled images")
+    parser.add_argument("images", nargs="+")
+    parser.add_argument("--size", default="400x600", help="WIDTHxHEIGHT the game draws them at")
+    parser.add_argument("--alpha", action="store_true", help="keep the alpha channel")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+    size = tuple(int(n) for n in args.size.lower().split("x"))
+    for path in args.images:
+        load_image(path, size, args.alpha, args.cache_dir)
+        print(f"Cached {path} at {size[0]}x{size[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import string
+import threading
+
+import pygame
+
+LETTERS = [''] + list(string.ascii_uppercase)  # Blank tile first
+
+
+# Every tile variant pre-rendered into one surface.
+#
+# A tile looks the same wherever it is, so each (colour, letter) pair is
+# drawn once with draw(surface, x, y, color, letter) into a grid: one row
+# per colour, one column per letter. A frame of tiles is then a single
+# Surface.blits() call copying areas out of the grid, however elaborate
+# the tile art is. build() can run on a warm-up thread; the first draw
+# builds the atlas itself if that hasn't happened yet.
+class TileAtlas:
+    def __init__(self, tile_width, tile_height, colors, draw, letters=LETTERS):
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.colors = list(colors)
+        self.letters = list(letters)
+        self.draw = draw
+        self.surface = None
+        self._areas = {}
+        self._lock = threading.Lock()
+
+    def build(self):
+        with self._lock:
+            if self.surface is not None:
+                return
+            surface = pygame.Surface((self.tile_width * len(self.letters), self.tile_height * len(self.colors)))
+            areas = {}
+            for row, color in enumerate(self.colors):
+                for column, letter in enumerate(self.letters):
+                    x, y = column * self.tile_width, row * self.tile_height
+                    surface.set_clip((x, y, self.tile_width, self.tile_height))
+                    self.draw(surface, x, y, color, letter)
+                    areas[row, letter] = pygame.Rect(x, y, self.tile_width, self.tile_height)
+            surface.set_clip(None)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            self._areas = areas
+            self.surface = surface
+
+    # Draw (id, x, y, letter, color index) tiles, e.g. from
+    # TileField.tiles(), and return the rects they cover
+    def blits(self, screen, tiles):
+        if self.surface is None:
+            self.build()
+        surface = self.surface
+        areas = self._areas
+        batch = []
+        rects = []
+        for tile, x, y, letter, color in tiles:
+            area = areas.get((color, letter))
+            if area is None:
+                # Not in the atlas, e.g. a letter outside LETTERS
+                rects.append(self.draw(screen, x, y, self.colors[color], letter))
+            else:
+                batch.append((surface, (x, y), area))
+        return screen.blits(batch) + rects
@@ -0,0 +1,160 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import pygame
+
+SOUND_CACHE_BUDGET = 32 * 1024 * 1024  # Bytes of track files and decoded audio kept in memory
+CLIP_MAX_FILE_SIZE = 512 * 1024  # Larger files are streamed instead of decoded up front
+MUSIC_CHANNEL = 0  # Reserved for tracks played from a decoded Sound
+
+
+# Background music tracks, loaded when a level needs them.
+#
+# load() reads a track file into memory and fully decodes short clips
+# into Sounds; it can run off the main thread, e.g. to fetch the track of
+# the level most likely to be played while a menu is showing, and
+# prefetch() does that on a background thread of its own. play() then
+# never touches the disk for a loaded track. A decoded clip starts on its
+# reserved channel, anything longer streams from memory through
+# pygame.mixer.music. Tracks not played for a while are dropped once the
+# memory they take passes the budget.
+class AudioManager:
+    def __init__(self, budget=SOUND_CACHE_BUDGET):
+        self.budget = budget
+        self.used = 0
+        self.missing = set()
+        self._tracks = OrderedDict()  # path -> (file bytes, Sound or None, bytes used), oldest first
+        self._channel = None
+        self._sound_started = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._wanted = None  # Track the prefetch thread loads next
+        self._fetching = None  # Track the prefetch thread is loading now
+        self._fetched = threading.Event()
+        self._fetched.set()
+        self._wake = threading.Event()
+        self._prefetcher = None
+
+    # Reserve the music channel; needs the mixer
+    def prepare(self):
+        try:
+            pygame.mixer.set_reserved(MUSIC_CHANNEL + 1)
+            self._channel = pygame.mixer.Channel(MUSIC_CHANNEL)
+        finally:
+            self._ready.set()
+
+    # Bring a track into memory. Returns its (file bytes, Sound or None,
+    # bytes used), or None if it can't be played.
+    def load(self, path):
+        with self._lock:
+            entry = self._tracks.get(path)
+            if entry is not None:
+                self._tracks.move_to_end(path)
+                return entry
+            if path in self.missing:
+                return None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            self.missing.add(path)
+            print(f"Music track {path} is not available: {e}")
+            return None
+        sound = None
+        size = len(data)
+        if len(data) <= CLIP_MAX_FILE_SIZE:
+            try:
+                sound = pygame.mixer.Sound(file=io.BytesIO(data))
+            except pygame.error as e:
+                self.missing.add(path)
+                print(f"Music track {path} can't be decoded: {e}")
+                return None
+            size += _decoded_size(sound)
+        entry = (data, sound, size)
+        with self._lock:
+            if path not in self._tracks:
+                self._tracks[path] = entry
+                self.used += size
+            # Keep the newest track even if it alone is over the budget
+            while self.used > self.budget and len(self._tracks) > 1:
+                self.used -= self._tracks.popitem(last=False)[1][2]
+        return entry
+
+    # Load a track on a background thread. Only the latest request is
+    # kept, so scrolling quickly through levels doesn't queue up a file
+    # read for every one of them.
+    def prefetch(self, path):
+        with self._lock:
+            self._wanted = path
+            if self._prefetcher is None:
+                self._prefetcher = threading.Thread(target=self._prefetch_loop, name="music prefetch", daemon=True)
+                self._prefetcher.start()
+        self._wake.set()
+
+    def _prefetch_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                path, self._wanted = self._wanted, None
+                self._fetching = path
+                self._fetched.clear()
+            try:
+                # Clips are decoded, which needs the mixer
+                self._ready.wait()
+                if path is not None and pygame.mixer.get_init():
+                    self.load(path)
+            finally:
+                with self._lock:
+                    self._fetching = None
+                    self._fetched.set()
+
+    # Play a track on a loop. Does nothing if the mixer failed to start;
+    # the game then runs without music.
+    def play(self, path):
+        self._ready.wait()
+        self.stop()
+        if not pygame.mixer.get_init():
+            return
+        with self._lock:
+            fetching = self._fetching == path
+        if fetching:
+            # Let the prefetch finish rather than read the file twice
+            self._fetched.wait()
+        entry = self.load(path)
+        if entry is None:
+            print(f"Error loading music track: {path} is not available")
+            return
+        data, sound, size = entry
+        try:
+            if sound is not None:
+                self._channel.play(sound, loops=-1)
+                self._sound_started = pygame.time.get_ticks()
+                return
+            pygame.mixer.music.load(io.BytesIO(data), os.path.splitext(path)[1].lstrip('.'))
+            pygame.mixer.music.play(-1)
+        except pygame.error as e:
+            print(f"Error loading music track: {e}")
+
+    def stop(self):
+        if self._channel is not None:
+            self._channel.stop()
+        self._sound_started = None
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+
+    # Milliseconds the current track has been playing, counting every
+    # loop, or -1 if nothing is playing
+    def position(self):
+        if self._sound_started is not None:
+            return pygame.time.get_ticks() - self._sound_started
+        if pygame.mixer.get_init() and pygame.mixer.music.get_busy():
+            return pygame.mixer.music.get_pos()
+        return -1
+
+
+def _decoded_size(sound):
+    frequency, size, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency) * channels * abs(size) // 8
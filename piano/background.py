@@ -0,0 +1,75 @@
+import pygame
+
+# Static backgrounds are rendered once per window size and blitted every
+# frame, instead of being redrawn scanline by scanline.
+
+_builders = {}
+_cache = {}
+_cache_size = None
+
+
+# Register a function that renders a static background for a window size.
+# Screens can then draw it by name with draw(screen, name).
+def register(name, builder):
+    _builders[name] = builder
+    for key in [key for key in _cache if key[0] == name]:
+        del _cache[key]
+
+
+# Drop every cached surface so the next draw renders them again
+def invalidate():
+    global _cache_size
+    _cache.clear()
+    _cache_size = None
+
+
+# Render a vertical gradient through evenly spaced colour stops.
+# Only a 1px wide strip is computed; scaling it fills the full width.
+def render_gradient(size, stops):
+    width, height = size
+    strip = pygame.Surface((1, height))
+    segments = len(stops) - 1
+    for y in range(height):
+        pos = y * segments / height
+        i = min(int(pos), segments - 1)
+        t = pos - i
+        start, end = stops[i], stops[i + 1]
+        strip.set_at((0, y), tuple(int(start[c] + (end[c] - start[c]) * t) for c in range(3)))
+    return pygame.transform.scale(strip, (width, height))
+
+
+# Look up a cached surface, rendering it on first use for this size
+def _get(key, size, build):
+    global _cache_size
+    if size != _cache_size:
+        # The window was resized, every cached surface is stale
+        invalidate()
+        _cache_size = size
+    surface = _cache.get((key, size))
+    if surface is None:
+        surface = build(size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        _cache[(key, size)] = surface
+    return surface
+
+
+# Cached vertical gradient surface for a window size and colour stops
+def gradient(size, stops):
+    stops = tuple(tuple(color) for color in stops)
+    return _get(stops, size, lambda size: render_gradient(size, stops))
+
+
+# Cached surface of a background registered with register()
+def get(name, size):
+    return _get(name, size, _builders[name])
+
+
+# Blit a vertical gradient, cached by window size and colour stops
+def draw_gradient(screen, stops):
+    screen.blit(gradient(screen.get_size(), stops), (0, 0))
+
+
+# Blit a background registered with register()
+def draw(screen, name):
+    screen.blit(get(name, screen.get_size()), (0, 0))
@@ -0,0 +1,165 @@
+import argparse
+import os
+import random
+import struct
+from array import array
+
+# Beatmaps tell the game when and where tiles appear for a music track.
+#
+# A beatmap is stored next to its track with the extension .beats:
+#
+#   header  "PNOB", version (u8), 3 padding bytes, loop length in ms (u32)
+#   events  time in ms (u32), column (u8)
+#
+# All little endian, 5 bytes per event, sorted by time. The game streams
+# them in small chunks, so even a long song never sits in memory whole.
+# A beatmap only says when and where: every level playing the track picks
+# the letter of each tile with its own scheduler, so one track can back
+# levels with different words.
+#
+#   python -m piano.beatmap build Twinkle-Twinkle.mp3
+
+MAGIC = b"PNOB"
+VERSION = 2
+HEADER = struct.Struct("<4sB3xI")
+EVENT = struct.Struct("<IB")
+CHUNK_EVENTS = 256  # Events read from disk at a time
+
+
+def beatmap_path(track):
+    return os.path.splitext(track)[0] + ".beats"
+
+
+def write_beatmap(path, events, duration):
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, duration))
+        for time_ms, column in sorted(events):
+            f.write(EVENT.pack(time_ms, column))
+
+
+# Open the beatmap of a track if it has one
+def load_beatmap(track):
+    path = beatmap_path(track)
+    if not os.path.exists(path):
+        return None
+    try:
+        return BeatmapStream(path)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring beatmap {path}: {e}")
+        return None
+
+
+# Reads the events of a beatmap a chunk at a time as playback reaches them.
+# The track loops, so once the last event has been handed out the stream
+# starts over, shifted by the loop length.
+class BeatmapStream:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, self.duration = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} beatmap")
+        self._offset = HEADER.size  # File position of the next chunk
+        self._loop_start = 0  # Added to event times in the current loop
+        self._events = []
+        self._next = 0
+
+    def _read_chunk(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read(CHUNK_EVENTS * EVENT.size)
+        data = data[:len(data) - len(data) % EVENT.size]
+        if not data:
+            if self._offset == HEADER.size or not self.duration:
+                return False  # Empty beatmap, or nothing to loop over
+            self._offset = HEADER.size
+            self._loop_start += self.duration
+            return self._read_chunk()
+        self._offset += len(data)
+        self._events = [(self._loop_start + time_ms, column) for time_ms, column in EVENT.iter_unpack(data)]
+        self._next = 0
+        return True
+
+    # (time, column) events with a time up to position (ms since the track
+    # started)
+    def due(self, position):
+        while True:
+            if self._next == len(self._events) and not self._read_chunk():
+                return
+            event = self._events[self._next]
+            if event[0] > position:
+                return
+            self._next += 1
+            yield event
+
+
+# Times in ms of the onsets in a decoded track: hops whose energy rises
+# well above the recent average, at least min_gap ms apart
+def detect_onsets(samples, rate, channels, hop_ms=20, min_gap=300, sensitivity=1.5):
+    mono = samples[::channels]
+    hop = max(1, int(rate * hop_ms / 1000))
+    energies = []
+    for start in range(0, len(mono) - hop, hop):
+        chunk = mono[start:start + hop:4]
+        energies.append(sum(x * x for x in chunk) / len(chunk))
+
+    onsets = []
+    window = max(1, 1000 // hop_ms)  # About a second of history
+    last = -min_gap
+    for i in range(1, len(energies)):
+        history = energies[max(0, i - window):i]
+        average = sum(history) / len(history)
+        rising = energies[i] - energies[i - 1]
+        time_ms = i * hop_ms
+        if rising > 0 and energies[i] > sensitivity * average and time_ms - last >= min_gap:
+            onsets.append(time_ms)
+            last = time_ms
+    return onsets
+
+
+# Turn onsets into (time, column) tile events. A column is only reused
+# once its previous tile has had column_gap ms to move out of the way.
+def place_tiles(onsets, columns=4, column_gap=850, seed=0):
+    rng = random.Random(seed)
+    free_at = [0] * columns
+    events = []
+    for time_ms in onsets:
+        free = [column for column in range(columns) if free_at[column] <= time_ms]
+        if not free:
+            continue
+        column = rng.choice(free)
+        free_at[column] = time_ms + column_gap
+        events.append((time_ms, column))
+    return events
+
+
+def build(track, output=None, seed=0):
+    # Decoding goes through SDL_mixer; no window or sound card needed
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    pygame.mixer.init()
+    rate, size, channels = pygame.mixer.get_init()
+    sound = pygame.mixer.Sound(track)
+    samples = array('h')
+    samples.frombytes(sound.get_raw())
+    duration = int(sound.get_length() * 1000)
+    onsets = detect_onsets(samples, rate, channels)
+    events = place_tiles(onsets, seed=seed)
+    output = output or beatmap_path(track)
+    write_beatmap(output, events, duration)
+    print(f"Wrote {len(events)} tiles from {len(onsets)} onsets over {duration / 1000:.1f}s to {output}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate beatmaps from music tracks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="detect onsets in a track and write its beatmap")
+    build_parser.add_argument("track")
+    build_parser.add_argument("--output", help="beatmap file (default: next to the track)")
+    build_parser.add_argument("--seed", type=int, default=0, help="seed for column placement")
+    args = parser.parse_args(argv)
+    build(args.track, args.output, args.seed)
+
+
+if __name__ == "__main__":
+    main()
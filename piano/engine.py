@@ -0,0 +1,602 @@
+import pygame
+import os
+import random
+import string
+import struct
+import sys
+import time
+from datetime import datetime
+
+from piano import background, fonts
+from piano.render import DirtyRenderer
+from piano.game import Game
+from piano.timestep import FixedTimestep
+from piano.menu import Menu
+from piano.scrolllist import ScrollList
+from piano.overlay import MessageOverlay
+from piano.store import DEFAULT_PROFILE, ProgressStore
+from piano.startup import StartupTimer
+from piano.audio import MUSIC_CHANNEL, AudioManager
+from piano.notes import NoteEngine
+from piano.beatmap import load_beatmap
+from piano.profiler import HUD_FONT, FrameProfiler, ProfilerOverlay
+from piano.replay import LOCK, SPAWN, TAP, Recorder, Replay
+from piano.atlas import TileAtlas
+from piano.variants import DEFAULT_VARIANT, VARIANTS, pack_path
+from piano.levels import LevelPack, level_scheduler
+
+# The game engine behind every My First Piano variant. beza.py, elora.py,
+# beza/Eleanor.py and beza/taste.py only pick a variant of piano.variants
+# and call main(); everything else lives here.
+#
+#   python -m piano.engine elora
+
+# Screen dimensions
+SCREEN_WIDTH = 400
+SCREEN_HEIGHT = 600
+TILE_WIDTH = SCREEN_WIDTH // 4
+TILE_HEIGHT = 150
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GREY = (200, 200, 200)
+BLUE = (0, 0, 255)
+RED = (255, 0, 0)
+LIGHT_PURPLE = (204, 153, 255)
+LIGHT_BLUE = (173, 216, 230)
+
+# Game settings
+DAILY_LEVEL_LIMIT = 5
+DATA_FILE = "game_data.sqlite3"
+LEGACY_DATA_FILE = "game_data.json"  # Imported into DATA_FILE on first start
+PROFILE = os.environ.get("PIANO_PROFILE", DEFAULT_PROFILE)  # Child playing on this device
+DEFAULT_SCREEN_LOCK_TIME = 5  # Default to 5 minutes if no input is provided
+TILE_COLORS = [BLACK, BLUE, RED]
+TILE_SPAWN_INTERVAL = 1.0  # Seconds between new tiles
+SIMULATION_STEP = 1 / 60  # Gameplay advances in fixed steps of this many seconds
+MESSAGE_TIME = 2000  # Milliseconds a game message stays on screen
+STARTUP_REPORT = bool(os.environ.get("PIANO_STARTUP_REPORT"))  # Print startup timings
+MIXER_BUFFER = int(os.environ.get("PIANO_MIXER_BUFFER", 512))  # Samples, smaller means lower latency
+NOTE_LATENCY_REPORT = bool(os.environ.get("PIANO_NOTE_LATENCY"))  # Measure tap-to-note latency
+SPAWN_SEED = os.environ.get("PIANO_SEED")  # Fixed seed (an integer) for tile spawning, random if unset
+RECORD_FILE = os.environ.get("PIANO_RECORD", "last_round.replay")  # Input of the last round, empty to disable
+REPLAY_FILE = os.environ.get("PIANO_REPLAY")  # Replay this recording instead of playing
+REPLAY_FAST = bool(os.environ.get("PIANO_REPLAY_FAST"))  # Replay as fast as possible, not at real speed
+PERF_HUD = bool(os.environ.get("PIANO_PERF_HUD"))  # Show frame timings from the start, F3 toggles
+PERF_HUD_SIZE = 16  # Font size of the frame timings
+# Write frame timings here on exit (.csv or .json; JSON also gets the text cache counters)
+FRAME_TRACE = os.environ.get("PIANO_FRAME_TRACE")
+# Phases of a gameplay frame, in the order they run
+FRAME_PHASES = ["background", "hud", "events", "spawn", "update", "tiles", "present"]
+
+# Pygame is initialized by init() when the game starts, not on import
+screen = None
+# Settings of the variant being played, chosen by main()
+variant = VARIANTS[DEFAULT_VARIANT]
+startup = StartupTimer()
+
+# Levels of the variant, indexed by main(); a level's own file and track
+# are only loaded once it is picked
+levels = None
+LEVEL_PACK = os.environ.get("PIANO_LEVEL_PACK")  # Play this level pack instead of the variant's
+
+# Music tracks are loaded into memory when a level needs them
+audio = AudioManager()
+
+# Piano notes played when a tile is tapped, synthesized by the warm-up thread
+notes = NoteEngine(MUSIC_CHANNEL + 1, measure=NOTE_LATENCY_REPORT)
+
+# Function to play a music track, or stop the music for None
+def play_music(track):
+    if track is None:
+        audio.stop()
+    else:
+        audio.play(track)
+
+# Progress of every profile, kept in SQLite and written in the background.
+# Opened on first use, the title screen doesn't need it.
+game_store = None
+
+def get_game_store():
+    global game_store
+    if game_store is None:
+        game_store = ProgressStore(DATA_FILE, LEGACY_DATA_FILE)
+    return game_store
+
+# Function to read today's progress of a profile
+def read_game_data(profile=PROFILE):
+    today = datetime.now().date().isoformat()
+    return {"date": today, "levels_completed": get_game_store().completed_levels(profile, today)}
+
+# Function to record a finished round (level, completed, score,
+# duration_ms, mistakes) for a profile
+def write_game_data(play, profile=PROFILE):
+    get_game_store().record(profile, play)
+
+# Function to check if the player can continue
+def can_play():
+    return read_game_data()["levels_completed"] < DAILY_LEVEL_LIMIT
+
+# Update game data after a round
+def update_level_data(level, completed, score, duration_ms, mistakes):
+    write_game_data({
+        "level": level,
+        "completed": completed,
+        "score": score,
+        "duration_ms": duration_ms,
+        "mistakes": mistakes,
+    })
+
+# Draw a single tile with improved visuals, returns the rect it covers.
+# Tile positions, letters and colours live in a piano.tiles.TileField.
+def draw_tile(screen, x, y, color, letter=''):
+    rect = pygame.draw.rect(screen, color, (x, y, TILE_WIDTH, TILE_HEIGHT))
+    if letter:
+        textobj = fonts.render(letter, variant["font_sizes"]["tile"], WHITE)
+        textrect = textobj.get_rect()
+        textrect.center = (x + TILE_WIDTH // 2, y + TILE_HEIGHT // 2)
+        screen.blit(textobj, textrect)
+    return rect
+
+# Every look a tile can have, drawn once by draw_tile and blitted from there
+tile_atlas = TileAtlas(TILE_WIDTH, TILE_HEIGHT, TILE_COLORS, draw_tile)
+
+# Screen position of a click or touch event, None for mouse events that
+# SDL synthesized from a touch (the FINGERDOWN is handled instead)
+def tap_position(event):
+    if event.type == pygame.FINGERDOWN:
+        width, height = screen.get_size()
+        return (event.x * width, event.y * height)
+    if event.type == pygame.MOUSEBUTTONDOWN and not getattr(event, 'touch', False):
+        return event.pos
+    return None
+
+# Function to display text, size is the font size
+def draw_text(screen, text, size, color, x, y):
+    textobj = fonts.render(text, size, color)
+    textrect = textobj.get_rect()
+    textrect.center = (x, y)
+    screen.blit(textobj, textrect)
+
+# Gradient background surface, rendered once and cached by piano.background
+def gradient_background():
+    return background.gradient(screen.get_size(), (LIGHT_PURPLE, LIGHT_BLUE))
+
+# Gradient background function
+def draw_gradient_background():
+    screen.blit(gradient_background(), (0, 0))
+
+# Level selection screen with improved visuals. Levels of pack (the game's
+# own by default) sit in a ScrollList between the heading and the prompt,
+# so only the rows on screen are drawn and a pack of thousands of levels
+# scrolls as smoothly as one of three.
+class LevelSelectionMenu(Menu):
+    ROW_HEIGHT = 60
+
+    def __init__(self, pack=None):
+        self.pack = levels if pack is None else pack
+        top = SCREEN_HEIGHT // 2 - self.ROW_HEIGHT // 2
+        viewport = pygame.Rect(0, top, SCREEN_WIDTH, SCREEN_HEIGHT - 80 - top)
+        self.levels = ScrollList(len(self.pack), self.ROW_HEIGHT, viewport, self.draw_level)
+
+    def draw_level(self, screen, i, rect, selected):
+        color = BLUE if selected else GREY
+        draw_text(screen, self.pack.title(i), variant["font_sizes"]["menu"], color, rect.centerx, rect.centery)
+
+    def shown(self):
+        if self.pack is levels:
+            prefetch_level_music(self.levels.selected)
+
+    def draw(self, screen):
+        font_size = variant["font_sizes"]["menu"]
+        draw_gradient_background()
+        draw_text(screen, "Select Level", font_size, BLACK, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4)
+        self.levels.draw(screen)
+        draw_text(screen, "Press Enter to Start", font_size, BLACK, SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50)
+        self.levels.changed = False
+
+    def handle(self, event):
+        selected = self.levels.selected
+        result = self.levels.handle(event)
+        if self.levels.selected != selected and self.pack is levels:
+            prefetch_level_music(self.levels.selected)
+        if self.levels.changed:
+            self.dirty = True
+        return result
+
+    def animating(self):
+        return self.levels.animating()
+
+    def update(self, ms):
+        self.levels.update(ms)
+
+def level_selection_screen():
+    return LevelSelectionMenu().run(screen)
+
+# Parent configuration screen to set screen lock time in minutes
+class ParentConfigurationMenu(Menu):
+    def __init__(self):
+        self.input_box = pygame.Rect(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 2, SCREEN_WIDTH // 2, 40)
+        self.color = pygame.Color(variant["input_color"])
+        self.text = ''
+
+    def draw(self, screen):
+        font_size = variant["font_sizes"]["parent"]
+        draw_gradient_background()
+        draw_text(screen, "Set Screen Lock Time (minutes):", font_size, BLACK, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)
+        pygame.draw.rect(screen, self.color, self.input_box, 2)
+        txt_surface = fonts.render(self.text, font_size, self.color)
+        width = max(200, txt_surface.get_width()+10)
+        self.input_box.w = width
+        screen.blit(txt_surface, (self.input_box.x+5, self.input_box.y+5))
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN:
+                max_time = DEFAULT_SCREEN_LOCK_TIME
+                if self.text.isdigit():
+                    max_time = int(self.text) * 60  # Convert minutes to seconds
+                return max_time
+            elif event.key == pygame.K_BACKSPACE:
+                self.text = self.text[:-1]
+            else:
+                self.text += event.unicode
+        return None
+
+def parent_configuration_screen():
+    return ParentConfigurationMenu().run(screen)
+
+# Screen shown after a wrong tile, returns True when the player clicks
+class RestartMenu(Menu):
+    def draw(self, screen):
+        draw_gradient_background()
+        draw_text(screen, "Game Over!", 36, BLACK, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30)
+        draw_text(screen, "Click to Restart", 24, BLACK, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20)
+
+    def handle(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            return True
+        return None
+
+# Long-lived state shared by the scenes. Created once in main() and reused
+# for every round, so restarting doesn't pile up frames or resources.
+class Session:
+    def __init__(self):
+        self.screen_lock_time = None
+        self.level = None
+        self.replay = None  # Recording played back instead of live input
+        self.clock = pygame.time.Clock()
+        self.game = Game(SCREEN_WIDTH, SCREEN_HEIGHT, 4, TILE_HEIGHT, variant["tile_speed"], TILE_SPAWN_INTERVAL,
+                         SIMULATION_STEP, len(TILE_COLORS), variant["scoring"])
+        self.renderer = DirtyRenderer(screen, gradient_background)
+        self.overlay = MessageOverlay(variant["font_sizes"]["hud"], BLACK)
+        self.profiler = FrameProfiler(FRAME_PHASES)
+        self.perf_hud = ProfilerOverlay(self.profiler, PERF_HUD_SIZE, WHITE, (0, 0, 0, 160), PERF_HUD)
+
+def draw_score(score):
+    text = fonts.render(f"Score: {score}", variant["font_sizes"]["hud"], BLACK)
+    return screen.blit(text, [10, 10])
+
+def draw_target_word(word):
+    text = fonts.render(f"Form Word: {word}", variant["font_sizes"]["hud"], BLACK)
+    return screen.blit(text, [SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30])
+
+# Scenes of the game. Each one runs until it is done and returns the name
+# of the next scene, or None to quit.
+def title_scene(session):
+    # Display title screen before level selection
+    if title_screen() is None:
+        return None
+    return "parent_configuration"
+
+def parent_configuration_scene(session):
+    # Get screen lock time from parent
+    session.screen_lock_time = parent_configuration_screen()
+    if session.screen_lock_time is None:
+        return None
+    return "level_selection"
+
+def level_selection_scene(session):
+    session.level = level_selection_screen()
+    if session.level is None:
+        return None
+
+    if not can_play():
+        print("Daily limit reached. Try again tomorrow!")
+        return None
+    return "play"
+
+def play_scene(session):
+    clock = session.clock
+    game = session.game
+    renderer = session.renderer
+    overlay = session.overlay
+    profiler = session.profiler
+    perf_hud = session.perf_hud
+    screen_lock_time = session.screen_lock_time
+    replay = session.replay
+    messages = variant["messages"]
+    # A fast replay doesn't wait for anyone to read the messages
+    message_time = 0 if replay is not None and REPLAY_FAST else MESSAGE_TIME
+
+    timestep = FixedTimestep(SIMULATION_STEP)
+    frame_time = 0
+
+    try:
+        level = levels.load(session.level)
+    except (OSError, ValueError) as e:
+        print(f"Can't load level {session.level + 1}: {e}")
+        return None if replay is not None else "level_selection"
+
+    # Play the selected music track
+    play_music(level["track"])
+
+    if replay is not None:
+        # Everything that decides the round comes from the recording
+        word, seed, auto_spawn, beats = replay.word, replay.seed, replay.auto_spawn, None
+    else:
+        seed = random.randrange(2 ** 64) if SPAWN_SEED is None else int(SPAWN_SEED)
+        words = level["words"]
+        word = words[seed % len(words)]
+        # Tracks with a beatmap spawn their tiles on the beat, others at random
+        beats = load_beatmap(level["track"]) if level["track"] else None
+        auto_spawn = beats is None
+    game.tile_speed = level["tile_speed"] or variant["tile_speed"]
+    game.reset(word, random.Random(seed), auto_spawn=auto_spawn, scheduler=level_scheduler(level))
+
+    recorder = None
+    if RECORD_FILE and replay is None:
+        try:
+            recorder = Recorder(RECORD_FILE, variant["name"], levels.path, session.level, word, seed, SIMULATION_STEP,
+                                auto_spawn)
+        except (OSError, struct.error) as e:
+            print(f"Not recording this round: {e}")
+
+    def tap(x, y, input_time=None):
+        tile = game.tiles.tile_at(x, y)
+        if tile is not None:
+            notes.play(game.tiles.letter(tile), input_time)
+        game.tap(x, y)
+        if game.lost:
+            overlay.show(messages["lost"], message_time, "result")
+
+    # Feed the recorded input that belongs before the next step
+    def replay_input():
+        for kind, a, b in replay.due(game.steps):
+            if kind == TAP:
+                tap(a, b)
+            elif kind == SPAWN:
+                game.spawn(int(a))
+            elif kind == LOCK:
+                overlay.show(messages["locked"], message_time, "locked")
+
+    # Start the clocks once the level is loaded, so loading doesn't count
+    # as time played or show up as a long first frame
+    start_time = pygame.time.get_ticks()
+    renderer.invalidate()
+    clock.tick()
+    last_poll = time.perf_counter()
+    try:
+        while True:
+            profiler.begin()
+            # Only the HUD and tiles change, so erase and push just those
+            renderer.begin()
+            profiler.lap("background")
+            renderer.mark(draw_score(game.score))
+            renderer.mark(draw_target_word(game.expected_word))
+            profiler.lap("hud")
+
+            # A tap fetched now arrived at the earliest right after the last
+            # poll, so time its note from there
+            input_time = last_poll
+            events = pygame.event.get()
+            last_poll = time.perf_counter()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    return None
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE and variant["escape_quits"]:
+                    return None
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    perf_hud.toggle()
+                    continue
+                if overlay.active:
+                    # Keep key presses for whatever comes after the message
+                    overlay.hold(event)
+                    continue
+                pos = tap_position(event)
+                if pos is not None and replay is None:
+                    if recorder is not None:
+                        recorder.tap(game.steps, *pos)
+                    tap(*pos, input_time)
+            profiler.lap("events")
+
+            # The game stands still while a message is showing
+            if not overlay.active:
+                if beats is not None:
+                    position = audio.position()
+                    if position < 0:
+                        position = game.time * 1000  # No music playing, follow game time
+                    for beat_time, column in beats.due(position):
+                        if recorder is not None:
+                            recorder.spawn(game.steps, column)
+                        game.spawn(column)
+                profiler.lap("spawn")
+
+                # Advance the game in fixed steps so dropped frames don't slow it down
+                for _ in range(timestep.advance(frame_time / 1000)):
+                    if replay is not None:
+                        replay_input()
+                        if overlay.active or replay.finished(game.steps):
+                            break
+                    game.step()
+
+                if overlay.active:
+                    pass  # A replayed tap or lock already ended the round
+                elif game.completed and variant["word_completes"]:  # If the word is formed
+                    overlay.show(messages["completed"], message_time, "completed")
+                elif replay is not None:
+                    if replay.finished(game.steps):  # The recorded round was closed here
+                        return None
+                elif pygame.time.get_ticks() - start_time > screen_lock_time * 1000:  # Screen lock time check
+                    overlay.show(messages["locked"], message_time, "locked")
+                    if recorder is not None:
+                        recorder.lock(game.steps)
+            profiler.lap("update")
+
+            for rect in tile_atlas.blits(screen, game.tiles.tiles(timestep.alpha)):
+                renderer.mark(rect)
+            renderer.mark(overlay.draw(screen))
+            renderer.mark(perf_hud.draw(screen))
+            profiler.lap("tiles")
+
+            outcome = overlay.update()
+            if outcome is not None and replay is not None:
+                print(f"Replay ended: {outcome}, score {game.score} after {game.time:.2f}s")
+                return None
+            if outcome is not None:
+                if variant["records_progress"]:
+                    duration = pygame.time.get_ticks() - start_time
+                    update_level_data(session.level, outcome == "completed", game.score, duration, game.mistakes)
+                return variant["after_round"][outcome]
+
+            renderer.present()
+            profiler.lap("present")
+            profiler.end()
+            if replay is not None and REPLAY_FAST:
+                # One step per frame, as fast as frames can be drawn
+                clock.tick()
+                frame_time = SIMULATION_STEP * 1000
+            else:
+                frame_time = clock.tick(variant["fps"])
+    finally:
+        if recorder is not None:
+            recorder.close(game.steps)
+
+def result_scene(session):
+    if RestartMenu().run(screen):
+        return "title"
+    return None
+
+SCENES = {
+    "title": title_scene,
+    "parent_configuration": parent_configuration_scene,
+    "level_selection": level_selection_scene,
+    "play": play_scene,
+    "result": result_scene,
+}
+
+# Render the text of the game screens into the font cache ahead of time
+def warm_up_fonts():
+    font_sizes = variant["font_sizes"]
+    for letter in string.ascii_uppercase:
+        fonts.render(letter, font_sizes["tile"], WHITE)
+    for score in range(10):
+        fonts.render(f"Score: {score}", font_sizes["hud"], BLACK)
+    for size in set(font_sizes.values()):
+        fonts.get_font(None, size)
+    # Looking up a system font scans every installed font, which must not
+    # happen the first time F3 is pressed mid-round
+    fonts.get_font(HUD_FONT, PERF_HUD_SIZE)
+
+# Start reading the track of a level in the background, so it is in memory
+# by the time the level is picked. The level's own file is small, reading
+# it here also saves play_scene doing so.
+def prefetch_level_music(number):
+    try:
+        track = levels.load(number)["track"]
+    except (OSError, ValueError):
+        return  # play_scene reports it if the level is picked
+    if track:
+        audio.prefetch(track)
+
+# Get the music ready, with the first level's track in memory since it is
+# the one most likely to be played
+def warm_up_music():
+    audio.prepare()
+    track = levels.load(0)["track"]
+    if track:
+        audio.load(track)
+
+# Initialize only what the title screen needs, then warm up the rest in
+# the background while it is showing
+def init():
+    global screen
+    with startup.phase("display"):
+        pygame.display.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption(variant["title"])
+    with startup.phase("font"):
+        pygame.font.init()
+    pygame.mixer.pre_init(44100, -16, 2, MIXER_BUFFER)
+    startup.warm_up([
+        ("mixer", pygame.mixer.init),
+        ("music", warm_up_music),
+        ("fonts", warm_up_fonts),
+        ("tiles", tile_atlas.build),
+        ("notes", notes.load),
+    ])
+
+# Main game function, runs scenes of a variant until one of them quits
+def main(name=DEFAULT_VARIANT):
+    global variant, levels
+    replay = None
+    if REPLAY_FILE:
+        try:
+            replay = Replay(REPLAY_FILE)
+        except (OSError, ValueError) as e:
+            print(f"Can't replay {REPLAY_FILE}: {e}")
+            return
+        name = replay.variant  # Whichever game recorded it
+    variant = VARIANTS[name]
+    with startup.phase("levels"):
+        try:
+            # A replay plays the pack it was recorded with
+            levels = LevelPack(replay.pack if replay is not None else LEVEL_PACK or pack_path(variant))
+        except (OSError, ValueError) as e:
+            print(f"Can't open level pack: {e}")
+            return
+    init()
+    session = Session()
+    scene = "title"
+    if replay is not None:
+        # Straight into the recorded round, then quit
+        session.replay = replay
+        session.level = replay.level
+        scene = "play"
+    while scene is not None:
+        scene = SCENES[scene](session)
+    if FRAME_TRACE:
+        session.profiler.dump(FRAME_TRACE, renderer=pygame.display.get_driver(), size=[SCREEN_WIDTH, SCREEN_HEIGHT],
+                              text_cache=fonts.stats())
+    if NOTE_LATENCY_REPORT:
+        print(notes.latency_report(MIXER_BUFFER, variant["fps"]))
+
+# Title screen, returns True once Enter is pressed
+class TitleMenu(Menu):
+    def shown(self):
+        if startup.finished:
+            return
+        startup.finish()
+        if STARTUP_REPORT:
+            startup.warmed_up.wait()
+            print(startup.report())
+
+    def draw(self, screen):
+        draw_gradient_background()
+        font_sizes = variant["font_sizes"]
+        draw_text(screen, variant["title"], font_sizes["title"], BLACK, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50)
+        draw_text(screen, variant["start_prompt"], font_sizes["prompt"], BLACK, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+            return True
+        return None
+
+def title_screen():
+    return TitleMenu().run(screen)
+
+# Run the game, as the variant named on the command line
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_VARIANT)
+    pygame.quit()
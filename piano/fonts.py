@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+
+import pygame
+
+# Fonts are opened once per (name, size) and rendered text is kept in an
+# LRU cache, so tile letters and HUD strings are rasterized only once.
+# Everything goes through one lock so the cache can be warmed up from a
+# background thread while the first screen is already drawing.
+
+TEXT_CACHE_BUDGET = 2 * 1024 * 1024  # Bytes of rendered text surfaces to keep
+
+_fonts = {}
+_lock = threading.RLock()
+
+
+# Return the shared Font for a system font name and size
+def get_font(name, size):
+    with _lock:
+        font = _fonts.get((name, size))
+        if font is None:
+            if name is None:
+                # SysFont(None) ends up here anyway, but only after scanning
+                # every installed system font
+                font = pygame.font.Font(None, size)
+            else:
+                font = pygame.font.SysFont(name, size)
+            _fonts[(name, size)] = font
+        return font
+
+
+# LRU cache of rendered text surfaces bounded by their pixel memory
+class TextCache:
+    def __init__(self, budget=TEXT_CACHE_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, text, size, color, antialias=True, name=None):
+        with _lock:
+            return self._render(text, size, color, antialias, name)
+
+    def _render(self, text, size, color, antialias, name):
+        key = (text, size, tuple(color), antialias, name)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = get_font(name, size).render(text, antialias, color)
+        self._surfaces[key] = surface
+        self.size += _bytes(surface)
+        while self.size > self.budget and len(self._surfaces) > 1:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.size -= _bytes(evicted)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        with _lock:
+            self._surfaces.clear()
+            self.size = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._surfaces),
+            "bytes": self.size,
+        }
+
+
+def _bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+text_cache = TextCache()
+
+
+# Render text through the shared cache
+def render(text, size, color, antialias=True, name=None):
+    return text_cache.render(text, size, color, antialias, name)
+
+
+# Hit, miss and eviction counters of the shared cache
+def stats():
+    return text_cache.stats()
@@ -0,0 +1,113 @@
+import random
+
+from piano.scheduler import LetterScheduler
+from piano.tiles import TileField
+
+# Defaults match the window and pacing of the beza variant
+SCREEN_WIDTH = 400
+SCREEN_HEIGHT = 600
+COLUMNS = 4
+TILE_HEIGHT = 150
+TILE_SPEED = 180  # Pixels per second
+SPAWN_INTERVAL = 1.0  # Seconds between new tiles
+STEP = 1 / 60  # Seconds per simulation step
+TILE_COLOR_COUNT = 3
+
+# How taps are scored. With "in_order" the word has to be spelled from its
+# first letter, with "any_order" any letter still missing from it counts.
+# correct, blank and wrong are the points for a tap on such a tile; None
+# means the tap loses the round.
+IN_ORDER = {"order": "in_order", "correct": 1, "blank": None, "wrong": None}
+ANY_ORDER = {"order": "any_order", "correct": 1, "blank": 1, "wrong": None}
+POINTS = {"order": "any_order", "correct": 10, "blank": 1, "wrong": -5}
+
+
+# Rules of one round: falling tiles, the word to form and the score.
+#
+# Nothing here touches pygame. Time only moves through step(), which
+# advances one fixed simulation step, and every random choice comes from
+# the game's own rng, so a seeded game replays identically with or
+# without a window.
+class Game:
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, columns=COLUMNS, tile_height=TILE_HEIGHT,
+                 tile_speed=TILE_SPEED, spawn_interval=SPAWN_INTERVAL, step=STEP, color_count=TILE_COLOR_COUNT,
+                 scoring=IN_ORDER):
+        self.columns = columns
+        self.scoring = scoring
+        self.tile_speed = tile_speed
+        self.step_length = step
+        self.spawn_steps = round(spawn_interval / step)
+        self.color_count = color_count
+        self.tiles = TileField(width // columns, tile_height, height, columns)
+        self.reset("")
+
+    # Start a new round. Without auto_spawn tiles only appear through
+    # spawn(), e.g. from a beatmap. The scheduler picks the letters of
+    # spawned tiles; by default one with the standard weights.
+    def reset(self, word, rng=None, auto_spawn=True, scheduler=None):
+        self.rng = rng or random.Random()
+        self.auto_spawn = auto_spawn
+        self.scheduler = scheduler or LetterScheduler()
+        self.scheduler.reset()
+        self.expected_word = word
+        self.score = 0
+        self.steps = 0
+        self.mistakes = 0
+        self.lost = False
+        self.tiles.clear()
+
+    @property
+    def completed(self):
+        return not self.expected_word
+
+    # Simulated seconds since the round started
+    @property
+    def time(self):
+        return self.steps * self.step_length
+
+    def step(self):
+        self.steps += 1
+        if self.auto_spawn and self.steps % self.spawn_steps == 0:
+            self.spawn()
+        # All tiles move together and leave the screen oldest first
+        self.tiles.advance(self.tile_speed * self.step_length)
+        self.tiles.cull()
+
+    # Add a tile, in a random column with a scheduled letter unless given
+    def spawn(self, column=None, letter=None):
+        rng = self.rng
+        if column is None:
+            column = rng.randint(0, self.columns - 1)
+        if letter is None:
+            letter = self.scheduler.next_letter(rng, self.expected_word)
+        return self.tiles.spawn(column, letter, rng.randrange(self.color_count))
+
+    # Tap the point (x, y). Returns None if there is no tile, True if it
+    # was a letter the word needed and False otherwise; lost is set if the
+    # scoring rules end the round on that tap.
+    def tap(self, x, y):
+        tile = self.tiles.tile_at(x, y)
+        if tile is None:
+            return None
+        letter = self.tiles.letter(tile)
+        scoring = self.scoring
+        word = self.expected_word
+        if scoring["order"] == "in_order":
+            correct = letter and letter == word[:1]
+        else:
+            correct = letter and letter in word
+        if correct:
+            self.expected_word = word.replace(letter, '', 1)  # Remove the letter
+            self.score += scoring["correct"]
+            self.tiles.remove(tile)
+            return True
+        points = scoring["wrong"] if letter else scoring["blank"]
+        if points is None:
+            self.mistakes += 1
+            self.lost = True
+            return False
+        if points < 0:
+            self.mistakes += 1
+        self.score += points
+        self.tiles.remove(tile)
+        return False
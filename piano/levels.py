@@ -0,0 +1,118 @@
+import json
+import os
+
+from piano.scheduler import DEFAULT_WEIGHTS, LetterScheduler, for_level
+
+# Level packs: which levels a game has, in order, and what each one plays.
+#
+# A pack is a directory with a pack.json manifest listing its levels, and
+# one small JSON file per level:
+#
+#   pack.json    {"name": "Classic",
+#                 "levels": [{"title": "Old MacDonald", "file": "farm.json"}, ...]}
+#   farm.json    {"words": ["FARM"],
+#                 "track": "../../oldMcdonalds.mp3",
+#                 "tile_speed": 180,                        optional
+#                 "spawn": {"weights": {...}, "max_gap": 6}} optional
+#
+# Paths are relative to the pack directory. Opening a pack only reads the
+# manifest, so a pack of hundreds of levels starts as fast as one with
+# three. A level's own file is read when it is picked, and only the
+# level being played is kept. A manifest or level file that doesn't follow
+# this format raises ValueError, like one that isn't valid JSON.
+
+MANIFEST = "pack.json"
+
+
+class LevelPack:
+    def __init__(self, path):
+        if os.path.isdir(path):
+            path = os.path.join(path, MANIFEST)
+        with open(path) as f:
+            manifest = json.load(f)
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("levels"), list):
+            raise ValueError(f"level pack {path} needs a list of levels")
+        self.path = path
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.name = manifest.get("name", "")
+        self._index = manifest["levels"]
+        if not self._index:
+            raise ValueError(f"level pack {path} has no levels")
+        for number, entry in enumerate(self._index):
+            if not isinstance(entry, dict) or not isinstance(entry.get("file"), str):
+                raise ValueError(f"level {number + 1} of pack {path} needs a file")
+            if not isinstance(entry.get("title", ""), str):
+                raise ValueError(f"level {number + 1} of pack {path} has a title that isn't text")
+        self._loaded = None  # (number, level) of the last level loaded
+
+    def __len__(self):
+        return len(self._index)
+
+    def title(self, number):
+        entry = self._index[number]
+        return entry.get("title") or f"Level {number + 1}"
+
+    # Settings of level number (counted from 0) as a dict: words, track
+    # (an absolute path or None), tile_speed (None for the game's default)
+    # and spawn (None to follow the difficulty curve)
+    def load(self, number):
+        if self._loaded is not None and self._loaded[0] == number:
+            return self._loaded[1]
+        if not 0 <= number < len(self._index):
+            raise ValueError(f"level pack {self.path} has no level {number + 1}")
+        path = os.path.join(self.directory, self._index[number]["file"])
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"level {path} isn't a JSON object")
+        words = data.get("words")
+        if not isinstance(words, list) or not words or not all(
+                isinstance(word, str) and word.isalpha() and word.isascii() for word in words):
+            raise ValueError(f"level {path} needs a list of words made of letters A-Z")
+        words = [word.upper() for word in words]
+        track = data.get("track")
+        if track is not None and not isinstance(track, str):
+            raise ValueError(f"level {path} has a track that isn't a path")
+        tile_speed = data.get("tile_speed")
+        if tile_speed is not None and (isinstance(tile_speed, bool) or not isinstance(tile_speed, (int, float))
+                                       or tile_speed <= 0):
+            raise ValueError(f"level {path} needs a tile_speed above 0")
+        _check_spawn(data.get("spawn"), path)
+        level = {
+            "number": number,
+            "title": self.title(number),
+            "words": words,
+            "track": os.path.normpath(os.path.join(self.directory, track)) if track else None,
+            "tile_speed": tile_speed,
+            "spawn": data.get("spawn"),
+        }
+        self._loaded = (number, level)
+        return level
+
+
+# Raise ValueError unless spawn is None or valid spawn rules for a level
+def _check_spawn(spawn, path):
+    if spawn is None:
+        return
+    if not isinstance(spawn, dict):
+        raise ValueError(f"level {path} has spawn rules that aren't a JSON object")
+    weights = spawn.get("weights", {})
+    if not isinstance(weights, dict) or not all(
+            kind in DEFAULT_WEIGHTS and isinstance(weight, (int, float)) and not isinstance(weight, bool)
+            and weight >= 0 for kind, weight in weights.items()):
+        raise ValueError(f"level {path} needs spawn weights for {', '.join(DEFAULT_WEIGHTS)} of 0 or more")
+    if not any(dict(DEFAULT_WEIGHTS, **weights).values()):
+        raise ValueError(f"level {path} has spawn weights that are all 0")
+    # A max_gap of null turns the guarantee off
+    max_gap = spawn.get("max_gap")
+    if max_gap is not None and (isinstance(max_gap, bool) or not isinstance(max_gap, int) or max_gap < 0):
+        raise ValueError(f"level {path} needs a spawn max_gap of 0 or more")
+
+
+# Letter scheduler for a loaded level: its own spawn rules if it has any,
+# the difficulty curve otherwise
+def level_scheduler(level):
+    spawn = level["spawn"]
+    if spawn is None:
+        return for_level(level["number"])
+    return LetterScheduler(spawn.get("weights"), spawn.get("max_gap", for_level(level["number"]).max_gap))
@@ -0,0 +1,76 @@
+import pygame
+
+# Events after which a menu is redrawn without the handler asking for it
+REDRAW_EVENTS = (
+    pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.FINGERDOWN,
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWSIZECHANGED,
+)
+
+
+# Base class for menu screens.
+#
+# run() blocks in pygame.event.wait() instead of polling and only redraws
+# after input, so a menu left open uses next to no CPU. Menus that animate
+# return True from animating(); they get update() calls and redraws every
+# tick_ms until the animation settles.
+class Menu:
+    tick_ms = 33
+
+    # Draw the whole menu onto screen
+    def draw(self, screen):
+        raise NotImplementedError
+
+    # Handle one event. Return a result to close the menu with, or None to
+    # keep it open. Set self.dirty for redraws not covered by REDRAW_EVENTS.
+    def handle(self, event):
+        return None
+
+    def animating(self):
+        return False
+
+    # Advance animations by ms milliseconds
+    def update(self, ms):
+        pass
+
+    # Called once the menu is on screen for the first time
+    def shown(self):
+        pass
+
+    # Run the menu until it returns a result, None if the window was closed
+    def run(self, screen):
+        self.dirty = True
+        last_tick = pygame.time.get_ticks()
+        self.draw(screen)
+        pygame.display.flip()
+        self.dirty = False
+        self.shown()
+        while True:
+            if self.dirty:
+                self.draw(screen)
+                pygame.display.flip()
+                self.dirty = False
+
+            if self.animating():
+                event = pygame.event.wait(self.tick_ms)
+                now = pygame.time.get_ticks()
+                if now - last_tick >= self.tick_ms:
+                    self.update(now - last_tick)
+                    last_tick = now
+                    self.dirty = True
+            else:
+                event = pygame.event.wait()
+                last_tick = pygame.time.get_ticks()
+
+            if event.type == pygame.NOEVENT:
+                continue
+            if event.type == pygame.QUIT:
+                return None
+            if event.type in REDRAW_EVENTS:
+                self.dirty = True
+            result = self.handle(event)
+            if result is not None:
+                return result
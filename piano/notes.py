@@ -0,0 +1,113 @@
+import math
+import time
+from array import array
+
+import pygame
+
+NOTE_VOICES = 6  # Notes that can sound at the same time
+NOTE_LENGTH = 0.6  # Seconds
+NOTE_VOLUME = 0.35
+LATENCY_TARGET = 0.020  # Seconds from tap to audible note that still feels instant
+# Semitones from one white key to the next, starting at A
+WHITE_KEY_STEPS = [2, 1, 2, 2, 1, 2, 2]
+
+
+# Frequency of the white piano key a letter stands for. Letters walk up
+# the white keys from A3, so A-G sound as their own note names; blank
+# tiles get the A below.
+def letter_frequency(letter):
+    if not letter:
+        return 110.0
+    semitones = sum(WHITE_KEY_STEPS[i % 7] for i in range(ord(letter) - ord('A')))
+    return 220.0 * 2 ** (semitones / 12)
+
+
+# A decaying tone with a few harmonics, as 16 bit samples for the mixer
+def synthesize(frequency, length=NOTE_LENGTH):
+    rate, size, channels = pygame.mixer.get_init()
+    count = int(rate * length)
+    mono = array('h', bytes(2 * count))
+    step = 2 * math.pi * frequency / rate
+    decay = math.exp(-6 / count)
+    amplitude = 32767 * NOTE_VOLUME / 1.75
+    for i in range(count):
+        phase = step * i
+        mono[i] = int(amplitude * (math.sin(phase) + 0.5 * math.sin(2 * phase) + 0.25 * math.sin(3 * phase)))
+        amplitude *= decay
+    if channels == 1:
+        return mono
+    samples = array('h', bytes(2 * count * channels))
+    for channel in range(channels):
+        samples[channel::channels] = mono
+    return samples
+
+
+# Plays a note per tapped tile on a pool of reserved mixer channels.
+#
+# Nothing is decoded at tap time: load() synthesizes every note into a
+# Sound up front. play() takes a free voice, or steals the one that has
+# been sounding longest once all of them are busy. With measure set it
+# records how long each tap took to reach the mixer, counting the time the
+# tap may have waited in the event queue.
+class NoteEngine:
+    def __init__(self, first_channel, voices=NOTE_VOICES, measure=False):
+        self.first_channel = first_channel
+        self.voices = voices
+        self.measure = measure
+        self.latencies = []  # Seconds from input to channel.play()
+        self._sounds = {}
+        self._channels = []
+        self._started = []
+
+    # Reserve the channels and synthesize every note; needs the mixer
+    def load(self):
+        channels = self.first_channel + self.voices
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), channels))
+        pygame.mixer.set_reserved(channels)
+        self._channels = [pygame.mixer.Channel(i) for i in range(self.first_channel, channels)]
+        self._started = [0.0] * self.voices
+        for letter in [''] + [chr(code) for code in range(ord('A'), ord('Z') + 1)]:
+            self._sounds[letter] = pygame.mixer.Sound(buffer=synthesize(letter_frequency(letter)))
+
+    # Play the note of a letter; input_time is the perf_counter() value of
+    # the earliest moment the input can have arrived, i.e. the previous
+    # poll of the event queue (pygame events carry no timestamp)
+    def play(self, letter, input_time=None):
+        sound = self._sounds.get(letter)
+        if sound is None:
+            return
+        now = time.perf_counter()
+        voice = None
+        for i, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                voice = i
+                break
+        if voice is None:
+            # Out of voices: steal the oldest one
+            voice = self._started.index(min(self._started))
+        self._channels[voice].play(sound)
+        self._started[voice] = now
+        if self.measure and input_time is not None:
+            self.latencies.append(time.perf_counter() - input_time)
+
+    # Tap-to-note latency percentiles in ms, up to the mixer and up to the
+    # speaker: the mixer buffer adds up to buffer / frequency on top. With
+    # the event queue polled once a frame a tap can wait a whole frame, so
+    # at fps frames per second the queue alone may use up the target.
+    def latency_report(self, buffer, fps):
+        if not pygame.mixer.get_init():
+            return "No mixer, no notes were played"
+        rate, size, channels = pygame.mixer.get_init()
+        mixer = buffer / rate
+        lines = [f"Mixer buffer of {buffer} samples adds up to {mixer * 1000:.1f} ms",
+                 f"Event queue polled at {fps} fps adds up to {1000 / fps:.1f} ms"]
+        if self.latencies:
+            latencies = sorted(self.latencies)
+            for name, fraction in (("p50", 0.5), ("p95", 0.95), ("max", 1.0)):
+                value = latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+                lines.append(f"Input to mixer {name}: {value * 1000:.2f} ms, audible by {(value + mixer) * 1000:.2f} ms"
+                             f" over {len(latencies)} notes")
+        if 1 / fps + mixer > LATENCY_TARGET:
+            lines.append(f"At {fps} fps a tap can take {(1 / fps + mixer) * 1000:.1f} ms to be heard, more than the"
+                         f" {LATENCY_TARGET * 1000:.0f} ms target; that needs a higher frame rate or a smaller buffer")
+        return "\n".join(lines)
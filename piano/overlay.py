@@ -0,0 +1,65 @@
+import pygame
+
+from piano import fonts
+
+# Input that is held back while a message is showing. Taps and clicks are
+# not: they were aimed at the tiles and would otherwise answer the next
+# screen before anyone saw it.
+HELD_EVENTS = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.TEXTINPUT,
+)
+
+
+# Timed message drawn on top of a running loop.
+#
+# Instead of sleeping, the loop keeps pumping events and rendering while
+# the message is up and passes every event to hold(). Key presses are
+# posted back to the event queue once the message expires, so whatever
+# screen comes next still receives them; taps meant for the game are
+# dropped.
+class MessageOverlay:
+    def __init__(self, size, color):
+        self.size = size
+        self.color = color
+        self.message = None
+        self._result = None
+        self._until = 0
+        self._held = []
+
+    @property
+    def active(self):
+        return self.message is not None
+
+    # Show message for duration milliseconds; update() returns result
+    # once it has expired
+    def show(self, message, duration, result=None):
+        self.message = message
+        self._result = result
+        self._until = pygame.time.get_ticks() + duration
+
+    def hold(self, event):
+        if event.type in HELD_EVENTS:
+            self._held.append(event)
+
+    # Return the result passed to show() once the message has expired,
+    # None while it is still showing
+    def update(self):
+        if not self.active or pygame.time.get_ticks() < self._until:
+            return None
+        self.message = None
+        for event in self._held:
+            pygame.event.post(event)
+        self._held = []
+        return self._result
+
+    # Draw the message centred on screen, returns the rect it covers
+    def draw(self, screen):
+        if not self.active:
+            return pygame.Rect(0, 0, 0, 0)
+        textobj = fonts.render(self.message, self.size, self.color)
+        textrect = textobj.get_rect()
+        textrect.center = screen.get_rect().center
+        return screen.blit(textobj, textrect)
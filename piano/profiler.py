@@ -0,0 +1,140 @@
+import csv
+import json
+import os
+import time
+from array import array
+
+import pygame
+
+from piano import fonts
+
+FRAME_HISTORY = 600  # Frames kept for percentiles, 10 seconds at 60 fps
+HUD_REFRESH = 30  # Frames between updates of the on-screen numbers
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+HUD_FONT = "monospace"  # Keeps the columns lined up
+
+
+# Times the phases of every frame into a ring buffer.
+#
+# The loop calls begin() at the top of a frame, lap(name) after each phase
+# and end() once the frame is presented. A lap is the time since the
+# previous lap, so phases don't nest and cost one perf_counter() call each.
+# Only the last capacity frames are kept, which is what percentiles and
+# trace files are computed from.
+class FrameProfiler:
+    def __init__(self, phases, capacity=FRAME_HISTORY):
+        self.phases = list(phases)
+        self.columns = self.phases + ["frame"]
+        self.capacity = capacity
+        self.frames = 0  # Frames recorded so far, including overwritten ones
+        self._samples = {name: array('d', bytes(8 * capacity)) for name in self.columns}
+        self._start = self._last = 0.0
+
+    def begin(self):
+        slot = self.frames % self.capacity
+        for samples in self._samples.values():
+            samples[slot] = 0.0
+        self._start = self._last = time.perf_counter()
+
+    # Add the time since the previous lap to phase name
+    def lap(self, name):
+        now = time.perf_counter()
+        self._samples[name][self.frames % self.capacity] += now - self._last
+        self._last = now
+
+    def end(self):
+        self._samples["frame"][self.frames % self.capacity] = time.perf_counter() - self._start
+        self.frames += 1
+
+    # Number of frames currently in the buffer
+    def __len__(self):
+        return min(self.frames, self.capacity)
+
+    # Seconds per phase of the buffered frames, oldest first
+    def rows(self):
+        count = len(self)
+        first = self.frames % self.capacity if self.frames > self.capacity else 0
+        for i in range(count):
+            slot = (first + i) % self.capacity
+            yield [self._samples[name][slot] for name in self.columns]
+
+    # Mean and percentiles of every phase in milliseconds
+    def summary(self):
+        count = len(self)
+        summary = {}
+        for name in self.columns:
+            values = sorted(self._samples[name][:count])
+            stats = {"mean": sum(values) / count * 1000 if count else 0.0}
+            for label, fraction in PERCENTILES:
+                stats[label] = values[min(count - 1, int(count * fraction))] * 1000 if count else 0.0
+            summary[name] = stats
+        return summary
+
+    # Write the buffered frames to path, as JSON if it ends in .json and
+    # as CSV (milliseconds per phase, one row per frame) otherwise. info,
+    # e.g. the text cache counters, only goes into JSON traces.
+    def dump(self, path, **info):
+        rows = [[round(value * 1000, 4) for value in row] for row in self.rows()]
+        if os.path.splitext(path)[1].lower() == ".json":
+            trace = dict(info, columns=self.columns, frames=rows, summary=self.summary())
+            with open(path, 'w') as f:
+                json.dump(trace, f, indent=1)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow([name + "_ms" for name in self.columns])
+                writer.writerows(rows)
+
+
+# Percentiles of a FrameProfiler drawn in the corner of the screen, with
+# the hit, miss and eviction counts of the text cache below them. The
+# text is only re-rendered every refresh frames so drawing it costs
+# little more than a blit.
+class ProfilerOverlay:
+    def __init__(self, profiler, size, color, background, visible=False, refresh=HUD_REFRESH):
+        self.profiler = profiler
+        self.font_name = HUD_FONT
+        self.size = size
+        self.color = color
+        self.background = background
+        self.visible = visible
+        self.refresh = refresh
+        self._surface = None
+        self._rendered_at = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._surface = None
+
+    def _render(self):
+        font = fonts.get_font(self.font_name, self.size)
+        summary = self.profiler.summary()
+        lines = [f"{'ms':<10}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name in self.profiler.columns:
+            stats = summary[name]
+            lines.append(f"{name:<10}{stats['p50']:7.2f}{stats['p95']:7.2f}{stats['p99']:7.2f}")
+        text = fonts.stats()
+        lines.append(f"{'text':<10}{'hit':>7}{'miss':>7}{'evict':>7}")
+        lines.append(f"{'cache':<10}{text['hits']:7}{text['misses']:7}{text['evictions']:7}")
+        # Rendered straight from the font: the numbers change all the time
+        # and would only churn the text cache
+        texts = [font.render(line, True, self.color) for line in lines]
+        width = max(text.get_width() for text in texts) + 8
+        height = sum(text.get_height() for text in texts) + 8
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill(self.background)
+        y = 4
+        for text in texts:
+            surface.blit(text, (4, y))
+            y += text.get_height()
+        self._surface = surface
+        self._rendered_at = self.profiler.frames
+
+    # Draw in the top right corner, returns the rect it covers
+    def draw(self, screen):
+        if not self.visible:
+            return pygame.Rect(0, 0, 0, 0)
+        if self._surface is None or self.profiler.frames - self._rendered_at >= self.refresh:
+            self._render()
+        rect = self._surface.get_rect(topright=(screen.get_width(), 0))
+        return screen.blit(self._surface, rect)
@@ -0,0 +1,48 @@
+import pygame
+
+# Above this fraction of the screen area a single full flip is cheaper
+# than pushing many small rectangles
+FULL_FLIP_FRACTION = 0.5
+
+
+# Renderer that only erases and pushes the regions that changed.
+# Each frame: begin() restores the background under everything drawn last
+# frame, mark() records what gets drawn now, present() sends both sets of
+# rects to the display.
+class DirtyRenderer:
+    def __init__(self, screen, get_background, full_fraction=FULL_FLIP_FRACTION):
+        self.screen = screen
+        self.get_background = get_background
+        self.full_fraction = full_fraction
+        self._previous = []
+        self._drawn = []
+        self._full = True
+
+    # Repaint and flip the whole screen on the next frame
+    def invalidate(self):
+        self._full = True
+
+    def begin(self):
+        background = self.get_background()
+        if self._full:
+            self.screen.blit(background, (0, 0))
+        else:
+            self.screen.blits([(background, rect, rect) for rect in self._drawn], False)
+        self._previous = self._drawn
+        self._drawn = []
+
+    # Record a region drawn this frame, e.g. the rect returned by blit()
+    def mark(self, rect):
+        rect = self.screen.get_rect().clip(rect)
+        if rect.w and rect.h:
+            self._drawn.append(rect)
+        return rect
+
+    def present(self):
+        dirty = self._previous + self._drawn
+        area = sum(rect.w * rect.h for rect in dirty)
+        if self._full or area > self.full_fraction * self.screen.get_width() * self.screen.get_height():
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        self._full = False
@@ -0,0 +1,174 @@
+import argparse
+import os
+import random
+import struct
+import sys
+
+from piano.game import Game
+from piano.levels import LevelPack, level_scheduler
+from piano.variants import LEVELS_DIR, VARIANTS
+
+# Recordings of single rounds, to replay a reported session exactly.
+#
+# A round is fully decided by the game variant, the level pack, the seed
+# of its rng, the level and word, and the input that reached the game. Input is stored by simulation
+# step rather than wall-clock time, so a replay applies every tap, beat
+# spawn and screen lock right before the same step as the recorded round
+# did, however fast or slow its frames are. The round's last event is an
+# END at the step it stopped on, so a replay also runs the quiet stretch
+# after the last tap; a recording cut short by a crash has none and ends
+# at its last event. Every event is flushed as it is written.
+#
+#   header  "PNOR", version (u8), auto spawn (u8), 2 padding bytes,
+#           level (u32), seed (u64), step length in s (f64), word length
+#           (u8), word, variant name length (u8), variant name, pack
+#           path length (u16), pack path (UTF-8; relative to LEVELS_DIR
+#           for the packs that ship with the game)
+#   events  step (u32), kind (u8), two values (f64 each)
+#
+# All little endian. For a tap the values are its x and y, for a beat
+# spawn the column and 0, otherwise both are 0. A spawned tile's letter
+# comes from the level's scheduler, and so does the replayed one's.
+#
+#   python -m piano.replay last_round.replay
+
+MAGIC = b"PNOR"
+VERSION = 6
+HEADER = struct.Struct("<4sBBxxIQdB")
+EVENT = struct.Struct("<IBdd")
+
+TAP = 1
+SPAWN = 2
+LOCK = 3
+END = 4
+
+
+# Writes the input of one round as it happens. Raises struct.error for a
+# round that can't be stored, e.g. a negative seed, before touching path.
+class Recorder:
+    def __init__(self, path, variant, pack, level, word, seed, step, auto_spawn):
+        self.path = path
+        word = word.encode('ascii')
+        variant = variant.encode('ascii')
+        pack = os.path.abspath(pack)
+        if os.path.commonpath([pack, LEVELS_DIR]) == LEVELS_DIR:
+            pack = os.path.relpath(pack, LEVELS_DIR)
+        pack = pack.encode('utf-8')
+        header = HEADER.pack(MAGIC, VERSION, auto_spawn, level, seed, step, len(word)) + word
+        header += struct.pack("<B", len(variant)) + variant
+        header += struct.pack("<H", len(pack)) + pack
+        self._file = open(path, 'wb')
+        self._write(header)
+
+    def _write(self, data):
+        self._file.write(data)
+        self._file.flush()
+
+    def tap(self, step, x, y):
+        self._write(EVENT.pack(step, TAP, x, y))
+
+    def spawn(self, step, column):
+        self._write(EVENT.pack(step, SPAWN, column, 0))
+
+    def lock(self, step):
+        self._write(EVENT.pack(step, LOCK, 0, 0))
+
+    # End the recording with the step the round stopped on
+    def close(self, step):
+        self._write(EVENT.pack(step, END, 0, 0))
+        self._file.close()
+
+
+# A recorded round. due(step) hands out its events in order as the
+# replayed game reaches their step.
+class Replay:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError("not a replay")
+        magic, version, auto_spawn, self.level, self.seed, self.step, length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} replay")
+        self.path = path
+        self.auto_spawn = bool(auto_spawn)
+        start = HEADER.size + length
+        if len(data) < start + 1 or len(data) < start + 1 + data[start]:
+            raise ValueError("replay header is cut short")
+        self.word = data[HEADER.size:start].decode('ascii')
+        self.variant = data[start + 1:start + 1 + data[start]].decode('ascii')
+        if self.variant not in VARIANTS:
+            raise ValueError(f"unknown game variant {self.variant!r}")
+        start += 1 + data[start]
+        if len(data) < start + 2:
+            raise ValueError("replay header is cut short")
+        length, = struct.unpack_from("<H", data, start)
+        start += 2
+        if len(data) < start + length:
+            raise ValueError("replay header is cut short")
+        self.pack = os.path.join(LEVELS_DIR, data[start:start + length].decode('utf-8'))
+        start += length
+        end = len(data) - (len(data) - start) % EVENT.size  # Drop a torn last event
+        self.events = list(EVENT.iter_unpack(data[start:end]))
+        self.end = None  # Step the round stopped on, None if it was cut short
+        if self.events and self.events[-1][1] == END:
+            self.end = self.events.pop()[0]
+        self._next = 0
+
+    # Events recorded before step, as (kind, value, value)
+    def due(self, step):
+        events = self.events
+        while self._next < len(events) and events[self._next][0] <= step:
+            event = events[self._next]
+            self._next += 1
+            yield event[1:]
+
+    # True once every event is handed out and the game reached step, the
+    # step the recorded round stopped on
+    def finished(self, step):
+        return self._next == len(self.events) and (self.end is None or step >= self.end)
+
+
+# Replay a recording without a window, as fast as the CPU allows. Returns
+# how the round ended ("completed", "result" for a wrong tap, "locked",
+# or None if the recording stops first, e.g. because the game was closed
+# mid-round) and the game in its final state.
+def run(replay, game=None):
+    variant = VARIANTS[replay.variant]
+    level = LevelPack(replay.pack).load(replay.level)
+    game = game or Game(step=replay.step, scoring=variant["scoring"])
+    game.tile_speed = level["tile_speed"] or variant["tile_speed"]
+    game.reset(replay.word, random.Random(replay.seed), replay.auto_spawn, level_scheduler(level))
+    while True:
+        for kind, a, b in replay.due(game.steps):
+            if kind == TAP:
+                game.tap(a, b)
+                if game.lost:
+                    return "result", game
+            elif kind == SPAWN:
+                game.spawn(int(a))
+            elif kind == LOCK:
+                return "locked", game
+        if game.completed and variant["word_completes"]:
+            return "completed", game
+        if replay.finished(game.steps):
+            return None, game
+        game.step()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded round without a window")
+    parser.add_argument("replay")
+    args = parser.parse_args(argv)
+    try:
+        replay = Replay(args.replay)
+        outcome, game = run(replay)
+    except (OSError, ValueError) as e:
+        print(f"Can't replay {args.replay}: {e}")
+        return 1
+    print(f"{replay.variant} level {replay.level + 1} {replay.word} seed {replay.seed}: {outcome or 'unfinished'} "
+          f"after {game.time:.2f}s, score {game.score}, mistakes {game.mistakes}, {len(replay.events)} events")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import string
+
+# Kinds of tile the scheduler picks between:
+#   next   the letter the player needs now
+#   word   another letter of the target word
+#   other  any letter
+#   blank  no letter
+DEFAULT_WEIGHTS = {"next": 3, "word": 2, "other": 3, "blank": 2}
+# What spawning looked like before the scheduler: half blanks, half random letters
+LEGACY_WEIGHTS = {"next": 0, "word": 0, "other": 1, "blank": 1}
+MAX_GAP = 6  # Tiles that may spawn before the needed letter has to show up
+
+# Difficulty curve, one entry per level; levels past the end use the last.
+# Later levels give the needed letter less often and let it take longer.
+DIFFICULTY = [
+    {"weights": {"next": 4, "word": 2, "other": 2, "blank": 2}, "max_gap": 4},
+    {"weights": {"next": 3, "word": 2, "other": 3, "blank": 2}, "max_gap": 6},
+    {"weights": {"next": 2, "word": 2, "other": 4, "blank": 2}, "max_gap": 8},
+]
+
+
+# Picks the letter of each new tile so the word always moves forward.
+#
+# Letters are drawn by weight from the kinds above, but once max_gap tiles
+# in a row went by without the needed letter the next tile carries it.
+# All randomness comes from the rng passed in, so a seeded game spawns the
+# same letters every time. max_gap=None turns the guarantee off.
+class LetterScheduler:
+    def __init__(self, weights=None, max_gap=MAX_GAP):
+        weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.kinds = [kind for kind in weights if weights[kind] > 0]
+        self.weights = [weights[kind] for kind in self.kinds]
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self):
+        self.gap = 0  # Tiles spawned since the needed letter last appeared
+
+    # Letter for the next tile ('' for blank) while word is left to form
+    def next_letter(self, rng, word):
+        needed = word[:1]
+        if needed and self.max_gap is not None and self.gap >= self.max_gap:
+            kind = "next"
+        else:
+            kind = rng.choices(self.kinds, self.weights)[0]
+
+        if kind == "next":
+            letter = needed
+        elif kind == "word":
+            letter = rng.choice(word) if word else ''
+        elif kind == "other":
+            letter = rng.choice(string.ascii_uppercase)
+        else:
+            letter = ''
+
+        if needed and letter == needed:
+            self.gap = 0
+        else:
+            self.gap += 1
+        return letter
+
+
+# Scheduler for a level (counted from 0) following the difficulty curve
+def for_level(level):
+    settings = DIFFICULTY[min(level, len(DIFFICULTY) - 1)]
+    return LetterScheduler(settings["weights"], settings["max_gap"])
@@ -0,0 +1,206 @@
+import math
+
+import pygame
+
+FRICTION = 5.0  # Per second, how quickly a flicked list slows down
+SETTLE = 12.0  # Per second, how quickly the list eases to a scroll target
+MIN_VELOCITY = 20  # Pixels per second below which a flick stops
+TAP_SLOP = 10  # Pixels a press may move and still count as a tap
+VELOCITY_WINDOW = 100  # Milliseconds of dragging a flick's speed is measured over
+WHEEL_SPEED = 900  # Pixels per second added per notch of the mouse wheel
+
+
+# Scrolling list of rows of which only the visible ones are drawn.
+#
+# Nothing is kept per row: draw(screen) works out from the scroll offset
+# which rows overlap the viewport and calls draw_row(screen, index, rect,
+# selected) for just those, so a list of 3,000 rows draws as fast as one
+# of 3. Rows can be dragged with the mouse or a finger and keep moving
+# when flicked, slowing down with friction and easing back when pulled
+# past either end. Arrow, page and Home/End keys move the selection and
+# scroll it into view smoothly.
+#
+# It is meant to live inside a Menu: pass it events through handle(),
+# forward the menu's animating() and update() to it and redraw whenever
+# changed is set.
+class ScrollList:
+    def __init__(self, count, row_height, viewport, draw_row, selected=0):
+        self.count = count
+        self.row_height = row_height
+        self.viewport = pygame.Rect(viewport)
+        self.draw_row = draw_row
+        self.selected = 0
+        self.offset = 0.0  # Pixels scrolled from the top
+        self.velocity = 0.0  # Pixels per second while flicked
+        self.target = None  # Offset being eased to
+        self.changed = True  # Set when the list needs a redraw
+        self._press = None  # (start y, offset then) while pressed
+        self._dragged = False
+        self._samples = []  # (ms, y) of recent drag movement
+        self.select(selected, smooth=False)
+
+    @property
+    def max_offset(self):
+        return max(0, self.count * self.row_height - self.viewport.h)
+
+    def _clamp(self, offset):
+        return min(max(offset, 0), self.max_offset)
+
+    def visible_rows(self):
+        first = max(0, int(self.offset // self.row_height))
+        last = min(self.count, int((self.offset + self.viewport.h) // self.row_height) + 1)
+        return range(first, last)
+
+    def row_at(self, y):
+        index = int((y - self.viewport.y + self.offset) // self.row_height)
+        if self.viewport.top <= y < self.viewport.bottom and 0 <= index < self.count:
+            return index
+        return None
+
+    def draw(self, screen):
+        clip = screen.get_clip()
+        screen.set_clip(self.viewport)
+        top = self.viewport.y - round(self.offset)
+        for index in self.visible_rows():
+            rect = pygame.Rect(self.viewport.x, top + index * self.row_height, self.viewport.w, self.row_height)
+            self.draw_row(screen, index, rect, index == self.selected)
+        screen.set_clip(clip)
+
+    # Select a row and scroll until all of it is in view
+    def select(self, index, smooth=True):
+        if not self.count:
+            return
+        self.selected = index % self.count
+        top = self.selected * self.row_height
+        target = self.offset
+        if top < target:
+            target = top
+        elif top + self.row_height > target + self.viewport.h:
+            target = top + self.row_height - self.viewport.h
+        target = self._clamp(target)
+        self.velocity = 0.0
+        if smooth:
+            self.target = target
+        else:
+            self.offset = target
+            self.target = None
+        self.changed = True
+
+    def animating(self):
+        return self._press is None and (self.target is not None or self.velocity != 0)
+
+    # Advance a flick or an eased scroll by ms milliseconds
+    def update(self, ms):
+        if self._press is not None:
+            return
+        seconds = ms / 1000
+        if self.velocity:
+            self.offset += self.velocity * seconds
+            self.velocity *= math.exp(-FRICTION * seconds)
+            inside = 0 <= self.offset <= self.max_offset
+            if abs(self.velocity) < MIN_VELOCITY or not inside:
+                self.velocity = 0.0
+                if not inside:
+                    self.target = self._clamp(self.offset)
+        elif self.target is not None:
+            self.offset += (self.target - self.offset) * (1 - math.exp(-SETTLE * seconds))
+            if abs(self.target - self.offset) < 0.5:
+                self.offset = self.target
+                self.target = None
+        self.changed = True
+
+    # Handle one event. Returns the index of the chosen row, by Enter or
+    # by tapping the selected row, or None.
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            page = max(1, self.viewport.h // self.row_height)
+            if event.key == pygame.K_UP:
+                self.select(self.selected - 1)
+            elif event.key == pygame.K_DOWN:
+                self.select(self.selected + 1)
+            elif event.key == pygame.K_PAGEUP:
+                self.select(max(0, self.selected - page))
+            elif event.key == pygame.K_PAGEDOWN:
+                self.select(min(self.count - 1, self.selected + page))
+            elif event.key == pygame.K_HOME:
+                self.select(0)
+            elif event.key == pygame.K_END:
+                self.select(self.count - 1)
+            elif event.key == pygame.K_RETURN and self.count:
+                return self.selected
+            return None
+
+        if event.type == pygame.MOUSEWHEEL:
+            self.target = None
+            self.velocity -= event.y * WHEEL_SPEED
+            self.changed = True
+            return None
+
+        pointer = _pointer(event)
+        if pointer is None:
+            return None
+        kind, y = pointer
+        now = pygame.time.get_ticks()
+        if kind == "down":
+            if self.viewport.top <= y < self.viewport.bottom:
+                # Catch the list where it is, even mid-flick
+                self._press = (y, self.offset)
+                self._dragged = False
+                self._samples = [(now, y)]
+                self.velocity = 0.0
+                self.target = None
+            return None
+        if self._press is None:
+            return None
+
+        start_y, start_offset = self._press
+        if kind == "move":
+            if abs(y - start_y) > TAP_SLOP:
+                self._dragged = True
+            if self._dragged:
+                offset = start_offset - (y - start_y)
+                if not 0 <= offset <= self.max_offset:
+                    # Pulled past an end: follow the finger at half speed
+                    bound = self._clamp(offset)
+                    offset = bound + (offset - bound) / 2
+                self.offset = offset
+                self.changed = True
+            self._samples.append((now, y))
+            self._samples = [sample for sample in self._samples if now - sample[0] <= VELOCITY_WINDOW]
+            return None
+
+        # Released
+        self._press = None
+        if not self._dragged:
+            index = self.row_at(y)
+            if index is not None:
+                if index == self.selected:
+                    return index
+                self.select(index)
+            return None
+        first_time, first_y = self._samples[0]
+        if now > first_time:
+            self.velocity = -(y - first_y) * 1000 / (now - first_time)
+        if abs(self.velocity) < MIN_VELOCITY or not 0 <= self.offset <= self.max_offset:
+            self.velocity = 0.0
+            self.target = self._clamp(self.offset)
+        self.changed = True
+        return None
+
+
+# ("down" | "move" | "up", y in pixels) of a pointer event, None for other
+# events and for mouse events SDL synthesized from a touch
+def _pointer(event):
+    if event.type in (pygame.FINGERDOWN, pygame.FINGERMOTION, pygame.FINGERUP):
+        height = pygame.display.get_surface().get_height()
+        kind = {pygame.FINGERDOWN: "down", pygame.FINGERMOTION: "move", pygame.FINGERUP: "up"}[event.type]
+        return kind, event.y * height
+    if getattr(event, 'touch', False):
+        return None
+    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        return "down", event.pos[1]
+    if event.type == pygame.MOUSEMOTION and event.buttons[0]:
+        return "move", event.pos[1]
+    if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+        return "up", event.pos[1]
+    return None
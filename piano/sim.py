@@ -0,0 +1,118 @@
+import argparse
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from piano.game import Game
+from piano.scheduler import LEGACY_WEIGHTS, LetterScheduler, for_level
+from piano.levels import LevelPack, level_scheduler
+from piano.variants import DEFAULT_VARIANT, VARIANTS, pack_path
+
+# Headless batch runs of the gameplay rules. No window, no audio and no
+# wall clock: a simulated player taps tiles and time advances one fixed
+# step at a time, as fast as the CPU allows.
+#
+#   python -m piano.sim FARM TWINKLE --games 1000 --workers 8
+#   python -m piano.sim --variant elora
+#
+# Words are the levels in order, so each one is played with the letter
+# scheduler of its level on the difficulty curve. Without words every
+# level of the variant's level pack is played, with the level's spawn
+# rules and tile speed and the variant's scoring.
+
+TIME_LIMIT = 300  # Simulated seconds per game, the default parent time limit
+REACTION_TIME = 0.4  # Seconds a tile has to be on screen before the player taps it
+
+
+# Play one seeded game with a player that taps the next letter of the word
+# as soon as it has seen it for reaction_time, and never a wrong tile
+def play(word, seed, time_limit=TIME_LIMIT, reaction_time=REACTION_TIME, game_options=None, scheduler=None):
+    game = Game(**(game_options or {}))
+    game.reset(word, random.Random(seed), scheduler=scheduler)
+    tiles = game.tiles
+    max_steps = round(time_limit / game.step_length)
+    seen_at = -tiles.tile_height + game.tile_speed * reaction_time
+    while not game.completed and game.steps < max_steps:
+        game.step()
+        for tile, x, y, letter, color in tiles.tiles():
+            if letter == game.expected_word[0] and y >= seen_at:
+                game.tap(x + tiles.tile_width / 2, y + tiles.tile_height / 2)
+                break
+    return {
+        "word": word,
+        "seed": seed,
+        "completed": game.completed,
+        "time": game.time,
+        "score": game.score,
+    }
+
+
+# Play one game of word per seed from seed to seed+games-1 on a process pool
+def run(word, games, seed=0, workers=None, **options):
+    workers = workers or os.cpu_count() or 1
+    seeds = range(seed, seed + games)
+    with ProcessPoolExecutor(workers) as pool:
+        chunksize = max(1, games // (4 * workers))
+        return list(pool.map(partial(_play, word, options), seeds, chunksize=chunksize))
+
+
+def _play(word, options, seed):
+    return play(word, seed, **options)
+
+
+# Completion rate and completion time percentiles of a batch of results
+def summarize(results):
+    times = sorted(result["time"] for result in results if result["completed"])
+    summary = {"games": len(results), "completed": len(times) / len(results) if results else 0.0}
+    if times:
+        summary["mean"] = statistics.fmean(times)
+        summary["p50"] = times[len(times) // 2]
+        summary["p95"] = times[min(len(times) - 1, int(len(times) * 0.95))]
+        summary["max"] = times[-1]
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded games without a window")
+    parser.add_argument("words", nargs="*", help="target words to play (default: the variant's levels)")
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default=DEFAULT_VARIANT)
+    parser.add_argument("--pack", help="level pack directory (default: the variant's)")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--time-limit", type=float, default=TIME_LIMIT, help="simulated seconds per game")
+    parser.add_argument("--reaction-time", type=float, default=REACTION_TIME)
+    parser.add_argument("--max-gap", type=int, help="override the level's maximum gap before the needed letter")
+    parser.add_argument("--legacy", action="store_true", help="spawn random letters like before the scheduler")
+    args = parser.parse_args(argv)
+
+    variant = VARIANTS[args.variant]
+    if args.words:
+        levels = [(word.upper(), for_level(level), variant["tile_speed"]) for level, word in enumerate(args.words)]
+    else:
+        pack = LevelPack(args.pack or pack_path(variant))
+        levels = []
+        for number in range(len(pack)):
+            level = pack.load(number)
+            levels.append((level["words"][0], level_scheduler(level), level["tile_speed"] or variant["tile_speed"]))
+
+    for level, (word, scheduler, tile_speed) in enumerate(levels):
+        if args.legacy:
+            scheduler = LetterScheduler(LEGACY_WEIGHTS, max_gap=None)
+        elif args.max_gap is not None:
+            scheduler.max_gap = args.max_gap
+        game_options = {"tile_speed": tile_speed, "scoring": variant["scoring"]}
+        results = run(word, args.games, args.seed, args.workers,
+                      time_limit=args.time_limit, reaction_time=args.reaction_time, game_options=game_options,
+                      scheduler=scheduler)
+        summary = summarize(results)
+        line = f"Level {level + 1} {word:<12} completed {summary['completed']:6.1%} of {summary['games']} games"
+        if "mean" in summary:
+            line += f"  time mean {summary['mean']:.1f}s  p50 {summary['p50']:.1f}s  p95 {summary['p95']:.1f}s  max {summary['max']:.1f}s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Times the phases of startup, on the main thread and on the warm-up
+# thread that prepares what the first screen doesn't need yet
+class StartupTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []  # (name, thread, start, seconds), start relative to self.started
+        self.warmed_up = threading.Event()
+        self.finished = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append((name, threading.current_thread().name, start - self.started, end - start))
+
+    # Record a point in time, e.g. when the first frame is on screen
+    def mark(self, name):
+        with self._lock:
+            self.phases.append((name, threading.current_thread().name, time.perf_counter() - self.started, 0.0))
+
+    # Startup is over, e.g. once the first frame is on screen
+    def finish(self, name="first frame"):
+        self.mark(name)
+        self.finished = True
+
+    # Run (name, function) tasks one after another on a background thread
+    def warm_up(self, tasks):
+        def run():
+            for name, task in tasks:
+                with self.phase(name):
+                    try:
+                        task()
+                    except Exception as e:
+                        print(f"Warm-up of {name} failed: {e}")
+            self.warmed_up.set()
+
+        thread = threading.Thread(target=run, name="warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def report(self):
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase[2])
+        lines = ["Startup:"]
+        for name, thread, start, seconds in phases:
+            if seconds:
+                lines.append(f"  {name:<14} {start * 1000:7.1f} ms  +{seconds * 1000:6.1f} ms  [{thread}]")
+            else:
+                lines.append(f"  {name:<14} {start * 1000:7.1f} ms  [{thread}]")
+        return "\n".join(lines)
@@ -0,0 +1,195 @@
+import atexit
+import csv
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS plays (
+    id INTEGER PRIMARY KEY,
+    profile_id INTEGER NOT NULL REFERENCES profiles (id),
+    date TEXT NOT NULL,
+    level INTEGER,
+    completed INTEGER NOT NULL,
+    score INTEGER,
+    duration_ms INTEGER,
+    mistakes INTEGER,
+    finished_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS plays_by_profile_date ON plays (profile_id, date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+DEFAULT_PROFILE = "default"
+PLAY_COLUMNS = ("date", "level", "completed", "score", "duration_ms", "mistakes", "finished_at")
+
+
+def _connect(path):
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=FULL")
+    return db
+
+
+def _today():
+    return datetime.now().date().isoformat()
+
+
+# Play history of many child profiles in one SQLite database.
+#
+# Every finished round is kept as a row, indexed by (profile, date), so a
+# day's progress is an index lookup no matter how many years of history
+# there are. The only thing the game asks every round, how many levels a
+# profile completed today, is counted once and then kept in memory.
+#
+# record() never touches the disk on the calling thread: rows are queued
+# for a writer thread with its own connection, which commits everything
+# that piled up in one transaction.
+class ProgressStore:
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self._db = _connect(path)
+        self._db.executescript(SCHEMA)
+        if legacy_path:
+            self._import_legacy(legacy_path)
+        self._profiles = dict(self._db.execute("SELECT name, id FROM profiles"))
+        self._completed = {}
+        self._pending = []
+        self._writing = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="game-data-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def profile_id(self, name):
+        profile_id = self._profiles.get(name)
+        if profile_id is None:
+            with self._db:
+                self._db.execute("INSERT OR IGNORE INTO profiles (name) VALUES (?)", (name,))
+            (profile_id,) = self._db.execute("SELECT id FROM profiles WHERE name = ?", (name,)).fetchone()
+            self._profiles[name] = profile_id
+        return profile_id
+
+    def profiles(self):
+        return sorted(self._profiles)
+
+    # Number of levels the profile completed on date (default today)
+    def completed_levels(self, profile, date=None):
+        key = (profile, date or _today())
+        count = self._completed.get(key)
+        if count is None:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM plays WHERE profile_id = ? AND date = ? AND completed",
+                (self.profile_id(profile), key[1])).fetchone()
+            self._completed[key] = count
+        return count
+
+    # Queue a finished round for the writer thread. play is a dict with
+    # the keys of PLAY_COLUMNS; date and finished_at default to now.
+    def record(self, profile, play):
+        now = datetime.now()
+        row = dict(play)
+        row.setdefault("date", now.date().isoformat())
+        row.setdefault("finished_at", now.isoformat(timespec="seconds"))
+        row["completed"] = int(bool(row.get("completed")))
+        if row["completed"]:
+            key = (profile, row["date"])
+            self._completed[key] = self.completed_levels(*key) + 1
+        values = (self.profile_id(profile),) + tuple(row.get(column) for column in PLAY_COLUMNS)
+        with self._cond:
+            self._pending.append(values)
+            self._cond.notify_all()
+
+    # Rounds of a profile between two dates (inclusive), oldest first
+    def history(self, profile, start="", end="9999-12-31"):
+        self.flush()
+        cursor = self._db.execute(
+            f"SELECT {', '.join(PLAY_COLUMNS)} FROM plays "
+            "WHERE profile_id = ? AND date BETWEEN ? AND ? ORDER BY date, id",
+            (self.profile_id(profile), start, end))
+        for row in cursor:
+            yield dict(zip(PLAY_COLUMNS, row))
+
+    # Write every round as CSV, streaming rows straight from the cursor
+    def export_csv(self, f, profile=None):
+        self.flush()
+        query = f"SELECT profiles.name, {', '.join('plays.' + c for c in PLAY_COLUMNS)} FROM plays JOIN profiles ON profiles.id = plays.profile_id"
+        args = ()
+        if profile is not None:
+            query += " WHERE plays.profile_id = ?"
+            args = (self.profile_id(profile),)
+        writer = csv.writer(f)
+        writer.writerow(("profile",) + PLAY_COLUMNS)
+        writer.writerows(self._db.execute(query + " ORDER BY plays.id", args))
+
+    # Block until every recorded round is committed
+    def flush(self):
+        with self._cond:
+            while self._pending or self._writing:
+                self._cond.wait()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        db = _connect(self.path)
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    db.close()
+                    return
+                rows, self._pending = self._pending, []
+                self._writing = True
+            try:
+                with db:
+                    db.executemany(
+                        f"INSERT INTO plays (profile_id, {', '.join(PLAY_COLUMNS)}) "
+                        f"VALUES ({', '.join('?' * (len(PLAY_COLUMNS) + 1))})", rows)
+            except sqlite3.Error as e:
+                print(f"Error writing game data: {e}")
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+    # Bring over the single-day counter of the old game_data.json once
+    def _import_legacy(self, legacy_path):
+        if self._db.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+            return
+        data = {}
+        try:
+            with open(legacy_path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable game data in {legacy_path}: {e}")
+        with self._db:
+            if data.get("date") and data.get("levels_completed"):
+                self._db.execute("INSERT OR IGNORE INTO profiles (name) VALUES (?)", (DEFAULT_PROFILE,))
+                (profile_id,) = self._db.execute("SELECT id FROM profiles WHERE name = ?", (DEFAULT_PROFILE,)).fetchone()
+                self._db.executemany(
+                    "INSERT INTO plays (profile_id, date, completed, finished_at) VALUES (?, ?, 1, ?)",
+                    [(profile_id, data["date"], data["date"])] * data["levels_completed"])
+            self._db.execute("INSERT INTO meta (key, value) VALUES ('legacy_imported', ?)", (legacy_path,))
+
+
+# Export the whole database as CSV: python -m piano.store game_data.sqlite3
+if __name__ == "__main__":
+    store = ProgressStore(sys.argv[1])
+    store.export_csv(sys.stdout, sys.argv[2] if len(sys.argv) > 2 else None)
+    store.close()
@@ -0,0 +1,128 @@
+from array import array
+from collections import deque
+
+# Tiles are only compacted once this many dead entries sit at the front
+COMPACT_THRESHOLD = 64
+
+
+# Falling tiles stored in flat arrays instead of one object per tile.
+#
+# Every tile falls at the same speed, so the field keeps a single scroll
+# offset and each tile only remembers where it started: its top edge is
+# offset + start. Moving all tiles is one addition, and tiles leave the
+# bottom of the screen in the order they were spawned, so culling just
+# advances a head index over the arrays.
+#
+# Tiles are addressed by ids that stay valid until the tile is removed.
+# Each column also keeps a deque of its live ids, oldest (lowest) first,
+# so hit testing a point only looks at the few tiles in its column.
+class TileField:
+    def __init__(self, tile_width, tile_height, bottom, columns=4):
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.bottom = bottom
+        self.columns = columns
+        self.clear()
+
+    def clear(self):
+        self.offset = 0.0
+        self.previous_offset = 0.0
+        self._start = array('d')
+        self._column = array('B')
+        self._color = array('B')
+        self._letter = []
+        self._alive = bytearray()
+        self._head = 0   # First index that may still be alive
+        self._base = 0   # Id of the tile stored at index 0
+        self._count = 0
+        self._by_column = [deque() for _ in range(self.columns)]
+
+    def __len__(self):
+        return self._count
+
+    # Add a tile above the top of the screen and return its id
+    def spawn(self, column, letter='', color=0):
+        self._start.append(-self.tile_height - self.offset)
+        self._column.append(column)
+        self._color.append(color)
+        self._letter.append(letter)
+        self._alive.append(1)
+        self._count += 1
+        tile_id = self._base + len(self._start) - 1
+        self._by_column[column].append(tile_id)
+        return tile_id
+
+    # Move every tile down by distance pixels
+    def advance(self, distance):
+        self.previous_offset = self.offset
+        self.offset += distance
+
+    # Drop every tile whose top is below the screen, return how many
+    def cull(self):
+        limit = self.bottom - self.offset
+        start, alive = self._start, self._alive
+        head, end = self._head, len(start)
+        removed = 0
+        while head < end and (not alive[head] or start[head] > limit):
+            if alive[head]:
+                alive[head] = 0
+                removed += 1
+                # Oldest live tile of its column, so it is at the left
+                self._by_column[self._column[head]].popleft()
+            head += 1
+        self._head = head
+        self._count -= removed
+        if head > COMPACT_THRESHOLD and head * 2 > end:
+            self._compact()
+        return removed
+
+    def _compact(self):
+        head = self._head
+        del self._start[:head]
+        del self._column[:head]
+        del self._color[:head]
+        del self._letter[:head]
+        del self._alive[:head]
+        self._base += head
+        self._head = 0
+
+    def remove(self, tile_id):
+        i = tile_id - self._base
+        if self._alive[i]:
+            self._alive[i] = 0
+            self._count -= 1
+            self._by_column[self._column[i]].remove(tile_id)
+
+    def top(self, tile_id):
+        return self.offset + self._start[tile_id - self._base]
+
+    def column(self, tile_id):
+        return self._column[tile_id - self._base]
+
+    def letter(self, tile_id):
+        return self._letter[tile_id - self._base]
+
+    # Id of the oldest tile covering the point (x, y), or None
+    def tile_at(self, x, y):
+        column = int(x // self.tile_width)
+        if x < 0 or column >= self.columns:
+            return None
+        offset, start, base = self.offset, self._start, self._base
+        for tile_id in self._by_column[column]:
+            top = offset + start[tile_id - base]
+            if y >= top + self.tile_height:
+                # Every remaining tile in this column is higher up
+                return None
+            if y >= top:
+                return tile_id
+        return None
+
+    # Yield (id, x, y, letter, color) for every live tile, oldest first.
+    # alpha interpolates positions between the last two advance() calls.
+    def tiles(self, alpha=1.0):
+        offset = self.previous_offset + (self.offset - self.previous_offset) * alpha
+        width, base = self.tile_width, self._base
+        start, column, color, letter, alive = self._start, self._column, self._color, self._letter, self._alive
+        for i in range(self._head, len(start)):
+            if alive[i]:
+                yield base + i, column[i] * width, offset + start[i], letter[i], color[i]
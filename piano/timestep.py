@@ -0,0 +1,27 @@
+# Fixed timestep accumulator: the simulation always advances in steps of
+# the same length, however long the rendered frames take. Rendering can
+# then run at any rate and interpolate between the last two steps with
+# alpha.
+class FixedTimestep:
+    def __init__(self, step, max_steps=8):
+        self.step = step
+        self.max_steps = max_steps  # Catch-up limit for a single frame
+        self.accumulator = 0.0
+
+    # Add elapsed real time in seconds, return how many steps to simulate
+    def advance(self, elapsed):
+        self.accumulator += elapsed
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            # Far behind (e.g. the window was dragged), drop the backlog
+            # instead of freezing while catching up
+            self.accumulator %= self.step
+            steps = self.max_steps
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    # How far rendering is between the previous and the current step
+    @property
+    def alpha(self):
+        return self.accumulator / self.step
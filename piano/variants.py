@@ -0,0 +1,88 @@
+import os
+
+from piano.game import ANY_ORDER, IN_ORDER, POINTS
+
+# The games built on the engine. They share every screen and the whole
+# render, update and save path, and only differ in the settings below.
+#
+#   pack               level pack in LEVELS_DIR (see piano.levels)
+#   tile_speed         pixels per second, unless a level sets its own
+#   fps                frame rate cap, gameplay speed does not depend on it
+#   scoring            rules of piano.game
+#   font_sizes         of each kind of text
+#   input_color        outline and text of the parent's input box
+#   escape_quits       Escape ends a round and quits
+#   word_completes     forming the word ends the round; without it the round
+#                      goes on, scoring every tap, until the screen locks
+#   records_progress   rounds count towards the daily level limit
+#   after_round        scene each outcome leads to: "result" after a wrong
+#                      tile, "completed" or "locked"; None quits the game
+#   messages           shown when a round is lost, completed or locked
+
+BEZA = {
+    "name": "beza",
+    "title": "My First Piano",
+    "start_prompt": "Press Enter to Start",
+    "pack": "classic",
+    "tile_speed": 180,
+    "fps": 60,
+    "scoring": IN_ORDER,
+    "font_sizes": {"tile": 24, "hud": 24, "menu": 30, "parent": 24, "title": 48, "prompt": 36},
+    "input_color": "black",
+    "escape_quits": False,
+    "word_completes": True,
+    "records_progress": True,
+    "after_round": {"result": "result", "completed": "level_selection", "locked": None},
+    "messages": {
+        "lost": "Game Over!",
+        "completed": "Congratulations! Level Completed!",
+        "locked": "Time's Up! Screen Locked.",
+    },
+}
+
+# Letters in any order, blanks score a point and a wrong letter ends the
+# round. Either way the game is over once the round ends.
+ELEANOR = dict(
+    BEZA,
+    name="eleanor",
+    tile_speed=150,
+    fps=30,
+    scoring=ANY_ORDER,
+    font_sizes={"tile": 24, "hud": 24, "menu": 30, "parent": 24, "title": 40, "prompt": 40},
+    escape_quits=True,
+    after_round={"result": None, "completed": None, "locked": None},
+    messages={
+        "lost": "Oppsie, You Pressed the wrong tile!",
+        "completed": "Congratulations! You formed the word!",
+        "locked": "Screen Time Over!",
+    },
+)
+
+VARIANTS = {
+    "beza": BEZA,
+    # Points for every tile: letters of the word, blanks and even wrong ones.
+    # The round runs until the screen locks and isn't counted as a level.
+    "elora": dict(
+        BEZA,
+        name="elora",
+        start_prompt="Press Enter to Play",
+        pack="baby",
+        tile_speed=150,
+        fps=30,
+        scoring=POINTS,
+        word_completes=False,
+        records_progress=False,
+        font_sizes={"tile": 30, "hud": 30, "menu": 40, "parent": 30, "title": 50, "prompt": 50},
+        input_color="lightskyblue3",
+    ),
+    "eleanor": ELEANOR,
+    "taste": dict(ELEANOR, name="taste", input_color="lightskyblue3"),
+}
+DEFAULT_VARIANT = "beza"
+
+LEVELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "levels")
+
+
+# Directory of a variant's level pack
+def pack_path(variant):
+    return os.path.join(LEVELS_DIR, variant["pack"])
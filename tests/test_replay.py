@@ -0,0 +1,135 @@
+import json
+import random
+import struct
+
+import pytest
+
+from piano import replay
+from piano.game import Game
+from piano.levels import LevelPack, level_scheduler
+from piano.replay import Recorder, Replay
+from piano.variants import VARIANTS
+
+STEP = 1 / 60
+
+
+@pytest.fixture
+def pack(tmp_path):
+    with open(tmp_path / "pack.json", 'w') as f:
+        json.dump({"levels": [{"title": "Cat", "file": "cat.json"}]}, f)
+    with open(tmp_path / "cat.json", 'w') as f:
+        json.dump({"words": ["CAT"], "tile_speed": 240}, f)
+    return str(tmp_path)
+
+
+def new_game(pack, seed, auto_spawn=True):
+    variant = VARIANTS["beza"]
+    level = LevelPack(pack).load(0)
+    game = Game(step=STEP, scoring=variant["scoring"])
+    game.tile_speed = level["tile_speed"]
+    game.reset("CAT", random.Random(seed), auto_spawn, level_scheduler(level))
+    return game
+
+
+# Play a round the way the engine does, tapping the needed letter once its
+# tile is well on screen, and record it
+def play_round(pack, path, seed, max_steps=3000, auto_spawn=True, beats=()):
+    game = new_game(pack, seed, auto_spawn)
+    recorder = Recorder(path, "beza", pack, 0, "CAT", seed, STEP, auto_spawn)
+    beats = dict(beats)
+    try:
+        while not game.completed and game.steps < max_steps:
+            for tile, x, y, letter, color in game.tiles.tiles():
+                if letter and letter == game.expected_word[0] and y > 100:
+                    recorder.tap(game.steps, x + 10, y + 10)
+                    game.tap(x + 10, y + 10)
+                    break
+            if game.completed:
+                break
+            if game.steps in beats:
+                recorder.spawn(game.steps, beats[game.steps])
+                game.spawn(beats[game.steps])
+            game.step()
+    finally:
+        recorder.close(game.steps)
+    return game
+
+
+def test_replay_reproduces_a_completed_round(pack, tmp_path):
+    path = str(tmp_path / "round.replay")
+    live = play_round(pack, path, seed=5)
+    assert live.completed
+
+    recording = Replay(path)
+    assert (recording.variant, recording.level, recording.word, recording.seed) == ("beza", 0, "CAT", 5)
+    outcome, game = replay.run(recording)
+    assert outcome == "completed"
+    assert (game.steps, game.score, game.mistakes) == (live.steps, live.score, live.mistakes)
+
+
+def test_replay_of_beat_spawns_picks_the_same_letters(pack, tmp_path):
+    path = str(tmp_path / "beats.replay")
+    beats = {step: step % 4 for step in range(0, 3000, 40)}
+    live = play_round(pack, path, seed=11, auto_spawn=False, beats=beats)
+    assert live.completed
+
+    outcome, game = replay.run(Replay(path))
+    assert outcome == "completed"
+    assert (game.steps, game.score) == (live.steps, live.score)
+
+
+def test_replay_runs_to_the_end_of_a_round_without_input(pack, tmp_path):
+    path = str(tmp_path / "quiet.replay")
+    Recorder(path, "beza", pack, 0, "CAT", 3, STEP, True).close(150)
+
+    recording = Replay(path)
+    assert recording.events == []
+    assert recording.end == 150
+    outcome, game = replay.run(recording)
+    assert outcome is None
+    assert game.steps == 150
+    assert len(game.tiles) > 0
+
+
+def test_recording_cut_short_ends_at_its_last_event(pack, tmp_path):
+    path = str(tmp_path / "crash.replay")
+    recorder = Recorder(path, "beza", pack, 0, "CAT", 3, STEP, True)
+    recorder.tap(42, 0, 0)
+    recorder._file.close()  # As if the game crashed
+
+    recording = Replay(path)
+    assert recording.end is None
+    outcome, game = replay.run(recording)
+    assert outcome is None
+    assert game.steps == 42
+
+
+def test_damaged_recordings_raise_value_error(pack, tmp_path):
+    path = str(tmp_path / "round.replay")
+    play_round(pack, path, seed=5)
+    with open(path, 'rb') as f:
+        data = f.read()
+    header = len(data) - (len(Replay(path).events) + 1) * replay.EVENT.size  # Events and END
+    damaged = tmp_path / "damaged.replay"
+    for length in range(len(data)):
+        damaged.write_bytes(data[:length])
+        if length < header:
+            with pytest.raises(ValueError):
+                Replay(str(damaged))
+        else:
+            # Cut inside the events: the whole ones are kept
+            assert len(Replay(str(damaged)).events) == (length - header) // replay.EVENT.size
+
+
+def test_unrecordable_round_leaves_the_previous_recording(pack, tmp_path):
+    path = tmp_path / "round.replay"
+    path.write_bytes(b"previous")
+    with pytest.raises(struct.error):
+        Recorder(str(path), "beza", pack, 0, "CAT", -1, STEP, True)
+    assert path.read_bytes() == b"previous"
+
+
+def test_replay_uses_the_recorded_pack(pack, tmp_path):
+    path = str(tmp_path / "round.replay")
+    play_round(pack, path, seed=5)
+    assert Replay(path).pack == pack
@@ -0,0 +1,50 @@
+import random
+
+from piano.scheduler import LetterScheduler, for_level
+
+# Weights that never pick the needed letter on their own
+ONLY_BLANKS = {"next": 0, "word": 0, "other": 0, "blank": 1}
+
+
+def test_needed_letter_is_forced_after_max_gap_tiles():
+    scheduler = LetterScheduler(ONLY_BLANKS, max_gap=3)
+    rng = random.Random(1)
+    letters = [scheduler.next_letter(rng, "CAT") for _ in range(8)]
+    assert letters == ['', '', '', 'C', '', '', '', 'C']
+
+
+def test_gap_counts_from_the_last_needed_letter():
+    scheduler = LetterScheduler(max_gap=4)
+    rng = random.Random(7)
+    gap = 0
+    for _ in range(2000):
+        letter = scheduler.next_letter(rng, "DOG")
+        gap = 0 if letter == "D" else gap + 1
+        assert gap <= 4
+
+
+def test_no_max_gap_never_forces_the_letter():
+    scheduler = LetterScheduler(ONLY_BLANKS, max_gap=None)
+    rng = random.Random(1)
+    assert set(scheduler.next_letter(rng, "CAT") for _ in range(50)) == {''}
+
+
+def test_reset_starts_the_gap_over():
+    scheduler = LetterScheduler(ONLY_BLANKS, max_gap=2)
+    rng = random.Random(1)
+    scheduler.next_letter(rng, "AB")
+    scheduler.next_letter(rng, "AB")
+    scheduler.reset()
+    assert scheduler.next_letter(rng, "AB") == ''
+
+
+def test_same_seed_same_letters():
+    def letters(seed):
+        scheduler = for_level(1)
+        rng = random.Random(seed)
+        return [scheduler.next_letter(rng, "TWINKLE") for _ in range(100)]
+    assert letters(3) == letters(3)
+
+
+def test_levels_past_the_curve_use_its_last_entry():
+    assert for_level(99).max_gap == for_level(2).max_gap
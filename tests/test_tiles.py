@@ -0,0 +1,74 @@
+from piano.tiles import COMPACT_THRESHOLD, TileField
+
+
+def field():
+    return TileField(100, 150, 600, columns=4)
+
+
+def test_tile_at_finds_the_tile_under_a_point():
+    tiles = field()
+    tile = tiles.spawn(1, "A")
+    tiles.advance(200)  # Top edge at 50
+    assert tiles.tile_at(150, 60) == tile
+    assert tiles.tile_at(150, 199) == tile
+    assert tiles.tile_at(150, 40) is None
+    assert tiles.tile_at(150, 200) is None
+    assert tiles.tile_at(50, 60) is None
+    assert tiles.tile_at(-1, 60) is None
+    assert tiles.tile_at(400, 60) is None
+
+
+def test_tile_at_prefers_the_oldest_tile():
+    tiles = field()
+    lower = tiles.spawn(2)
+    tiles.advance(100)
+    upper = tiles.spawn(2)
+    tiles.advance(200)  # lower spans 150-300, upper spans 50-200
+    assert tiles.tile_at(250, 160) == lower
+    assert tiles.tile_at(250, 100) == upper
+
+
+def test_removed_tiles_are_not_hit():
+    tiles = field()
+    tile = tiles.spawn(0)
+    tiles.advance(200)
+    tiles.remove(tile)
+    assert tiles.tile_at(10, 100) is None
+    assert len(tiles) == 0
+
+
+def test_cull_drops_tiles_below_the_screen_oldest_first():
+    tiles = field()
+    first = tiles.spawn(0)
+    tiles.advance(300)
+    second = tiles.spawn(1)
+    tiles.advance(460)  # first's top at 610, second's at 310
+    assert tiles.cull() == 1
+    assert len(tiles) == 1
+    assert tiles.tile_at(10, 615) is None
+    assert tiles.tile_at(110, 320) == second
+    assert first != second
+
+
+def test_cull_skips_removed_tiles():
+    tiles = field()
+    removed = tiles.spawn(0)
+    tiles.spawn(1)
+    tiles.remove(removed)
+    tiles.advance(1000)
+    assert tiles.cull() == 1
+    assert len(tiles) == 0
+
+
+def test_ids_stay_valid_across_compaction():
+    tiles = field()
+    for i in range(COMPACT_THRESHOLD * 3):
+        tiles.spawn(i % 4)
+        tiles.advance(10)
+        tiles.cull()
+    tile = tiles.spawn(3, "Z")
+    tiles.advance(200)
+    tiles.cull()
+    assert tiles.letter(tile) == "Z"
+    assert tiles.tile_at(350, tiles.top(tile) + 1) == tile
+    assert [t[0] for t in tiles.tiles()][-1] == tile